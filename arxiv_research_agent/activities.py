@@ -4,13 +4,14 @@ Activities are the individual units of work that perform specific tasks
 within an orchestration. They are durable and can be retried on failure.
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Tuple
 
+import orjson
 from durabletask import task
 
-from .arxiv_api import search_arxiv
+from .arxiv_api import search_arxiv, search_arxiv_multi
 from .llm import call_llm, parse_json_response
 
 logger = logging.getLogger(__name__)
@@ -18,10 +19,157 @@ logger = logging.getLogger(__name__)
 # Maximum number of papers to analyze per query
 MAX_PAPERS_TO_ANALYZE = 15
 
+# Papers requested per search. Papers analyzed in earlier iterations are dropped
+# before analysis, so this leaves headroom above MAX_PAPERS_TO_ANALYZE.
+SEARCH_RESULTS_PER_QUERY = 30
+
+# Token budgets for paper fields in the analysis prompt. Abstracts are cut at a
+# sentence boundary; tokens are counted with tiktoken when it is installed,
+# otherwise estimated at ~4 characters per token.
+ABSTRACT_TOKEN_BUDGET = 120
+TITLE_TOKEN_BUDGET = 30
+_CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Return the tiktoken encoding, or None if tiktoken is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:  # not installed, or encoding could not be downloaded
+                    logger.debug(f"tiktoken unavailable, estimating token counts: {e}")
+                _encoding_loaded = True
+    return _encoding
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to roughly max_tokens, preferring a sentence boundary.
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        
+    Returns:
+        The original text if it fits, otherwise a shortened prefix
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = encoding.decode(tokens[:max_tokens])
+    else:
+        max_chars = max_tokens * _CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        truncated = text[:max_chars]
+
+    sentence_end = truncated.rfind(". ")
+    if sentence_end > 0:
+        return truncated[:sentence_end + 1]
+    return truncated.rstrip() + "..."
+
+# Static system prompts. Each is identical across calls and comes first in the
+# request, so providers can serve it from their prompt prefix cache; all dynamic
+# content (topic, query, papers, findings) goes in the user message. Findings
+# only grow between iterations, so they precede per-iteration values (iteration
+# number, scores) and the cached prefix keeps extending.
+_ANALYZE_SYSTEM_INSTRUCTIONS = """You are a research evaluation agent. Analyze arXiv papers and provide structured insights in JSON format. Focus on technical depth and research value.
+
+You will be given a research topic, the query used to search arXiv, and the papers found.
+
+Provide a DETAILED analysis of these research papers. Focus on:
+- Key research contributions, methodologies, and techniques
+- Specific experimental results, metrics, or benchmarks
+- Novel approaches, architectures, or algorithms proposed
+- Connections between papers and emerging research themes
+- Identified research gaps or open problems
+- Practical applications and potential impact
+- Most influential or highly relevant papers for this topic
+
+Return JSON with:
+- "insights": String array of specific, technical insights from the papers
+- "relevance_score": Number 1-10 (how relevant are these papers to the research topic)
+- "summary": Brief summary of the research landscape
+- "key_points": Array of most important research findings
+- "research_gaps": Array of identified gaps or future research directions"""
+
+_GAPS_SYSTEM_INSTRUCTIONS = """You are a research agent. Generate focused follow-up queries for arXiv search. Return only JSON array.
+
+You will be given a research topic, the current iteration, and the findings so far.
+
+Generate 2-4 SHORT KEYWORD-BASED search queries for arXiv that explore DIVERSE aspects of the topic.
+
+CRITICAL RULES:
+1. Use SHORT keywords (2-5 words max) - NOT long sentences
+2. Focus on DIFFERENT aspects, methodologies, or applications
+3. Use terms that appear in actual arXiv paper titles
+4. Consider exploring identified research gaps
+5. Avoid repeating previous queries
+
+GOOD examples: ["transformer attention mechanisms", "neural network pruning", "federated learning privacy"]
+BAD examples: ["What are the latest advances in transformer-based architectures for natural language processing?"]
+
+Return only a JSON array of SHORT keyword queries: ["query1", "query2", "query3"]"""
+
+_DECIDE_SYSTEM_INSTRUCTIONS = """You are a research decision agent. Evaluate research completeness and decide whether to continue. Return JSON.
+
+You will be given a research topic, the current iteration, the findings so far, and their average relevance score.
+
+Decide whether to continue research or conclude. Continue if:
+1. Current iteration is less than 75% of max_iterations
+2. Average relevance is above 6.0 and there are likely unexplored aspects
+3. Recent queries found significant new papers with valuable insights
+4. There are identified research gaps worth exploring
+
+Only stop early if:
+- Average relevance is below 5.0 for multiple iterations
+- No new meaningful information in the last 2 iterations
+- The topic has been comprehensively covered
+
+Return JSON with:
+- "should_continue": boolean"""
+
+_SYNTHESIZE_SYSTEM_INSTRUCTIONS = """You are a research analyst specializing in academic literature review. Provide comprehensive synthesis as a Markdown report.
+
+You will be given a research topic, arXiv research findings, and the available paper citations.
+Synthesize the findings into a comprehensive, detailed report about the topic.
+
+Create a comprehensive research report that flows naturally as a single narrative. Include:
+- Overview of the research landscape and current state of the field
+- Key methodologies, techniques, and approaches in the literature
+- Important experimental results, benchmarks, and comparisons
+- Emerging trends and research directions
+- Identified gaps and opportunities for future research
+- Practical implications and applications
+- INLINE LINKS: When referencing papers, include clickable links using [paper title](URL) format
+
+Structure the report with clear sections:
+1. Executive Summary
+2. Research Landscape Overview
+3. Key Findings and Methodologies
+4. Emerging Trends
+5. Research Gaps and Future Directions
+6. Conclusions
+
+Return only the report itself in Markdown, with no JSON wrapper and no commentary before or after it."""
+
 
 def search_arxiv_activity(ctx: task.ActivityContext, query: str) -> List[Dict[str, Any]]:
     """Activity: Search arXiv for papers about a topic.
     
+    Up to SEARCH_RESULTS_PER_QUERY papers are returned; the research
+    sub-orchestration drops the ones already analyzed and trims the rest to
+    MAX_PAPERS_TO_ANALYZE.
+    
     Args:
         ctx: Activity context
         query: Search query string
@@ -30,52 +178,79 @@ def search_arxiv_activity(ctx: task.ActivityContext, query: str) -> List[Dict[st
         List of paper dictionaries
     """
     logger.info(f"Searching arXiv for: {query}")
-    papers = search_arxiv(query, max_results=30)
+    papers = search_arxiv(query, max_results=SEARCH_RESULTS_PER_QUERY)
     logger.info(f"Found {len(papers)} papers")
     return papers
 
 
-def analyze_papers_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> Dict[str, Any]:
-    """Activity: Analyze arXiv papers and extract academic insights using LLM.
+def search_arxiv_multi_activity(
+    ctx: task.ActivityContext, queries: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Activity: Search arXiv for several queries with a single API request.
     
     Args:
         ctx: Activity context
-        input: Dictionary with topic, query, and papers
+        queries: Search query strings
         
     Returns:
-        Analysis result as dictionary
+        Dictionary mapping each query to its list of paper dictionaries
     """
-    topic = input["topic"]
-    query = input["query"]
-    papers = input["papers"]
-    
-    logger.info(f"Analyzing papers for topic: {topic}, query: {query}")
+    logger.info(f"Searching arXiv for {len(queries)} queries: {queries}")
+    papers_by_query = search_arxiv_multi(queries, per_query=MAX_PAPERS_TO_ANALYZE)
+    logger.info(
+        "Found " + ", ".join(f"{len(p)} papers for '{q}'" for q, p in papers_by_query.items())
+    )
+    return papers_by_query
 
-    # Create detailed content digest for LLM
+
+def _empty_analysis(query: str, summary: str, relevance_score: int = 0) -> Dict[str, Any]:
+    """Build an analysis result with no insights, for when the LLM is skipped or fails."""
+    return {
+        "query": query,
+        "insights": [],
+        "relevance_score": relevance_score,
+        "summary": summary,
+        "key_points": [],
+        "research_gaps": [],
+        "top_papers": [],
+    }
+
+
+def _build_papers_digest(papers: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Format papers for the analysis prompt and collect their full metadata.
+    
+    Args:
+        papers: Papers to include
+        
+    Returns:
+        Tuple of (prompt text, top_papers metadata list)
+    """
     papers_lines = []
     top_papers = []
 
-    for i, paper in enumerate(papers[:MAX_PAPERS_TO_ANALYZE]):
-        title = paper.get("title", "No title")
-        arxiv_id = paper.get("arxiv_id", "")
-        authors_list = paper.get("authors", [])
+    # Read each field once and reuse it for both the digest and top_papers
+    for i, paper in enumerate(papers, 1):
+        get = paper.get
+        title = get("title", "No title")
+        arxiv_id = get("arxiv_id", "")
+        authors_list = get("authors", [])
+        full_summary = get("summary", "")
+        published = get("published", "")
+        categories_list = get("categories", [])
+        abs_url = get("abs_url", "")
+
         authors = ", ".join(authors_list[:3])
         if len(authors_list) > 3:
             authors += " et al."
-        summary = paper.get("summary", "")[:500]
-        categories = ", ".join(paper.get("categories", [])[:3])
-        published = paper.get("published", "")[:10]
-        abs_url = paper.get("abs_url", "")
-        pdf_url = paper.get("pdf_url", "")
 
         papers_lines.append(
-            f"Paper {i+1}:\n"
-            f"  Title: {title}\n"
+            f"Paper {i}:\n"
+            f"  Title: {_truncate_tokens(title, TITLE_TOKEN_BUDGET)}\n"
             f"  arXiv ID: {arxiv_id}\n"
             f"  Authors: {authors}\n"
-            f"  Published: {published}\n"
-            f"  Categories: {categories}\n"
-            f"  Abstract: {summary}...\n"
+            f"  Published: {published[:10]}\n"
+            f"  Categories: {', '.join(categories_list[:3])}\n"
+            f"  Abstract: {_truncate_tokens(full_summary, ABSTRACT_TOKEN_BUDGET)}\n"
             f"  URL: {abs_url}\n"
         )
 
@@ -83,71 +258,90 @@ def analyze_papers_activity(ctx: task.ActivityContext, input: Dict[str, Any]) ->
             "arxiv_id": arxiv_id,
             "title": title,
             "authors": authors_list,
-            "summary": paper.get("summary", ""),
-            "published": paper.get("published", ""),
-            "primary_category": paper.get("primary_category", ""),
-            "categories": paper.get("categories", []),
-            "pdf_url": pdf_url,
+            "summary": full_summary,
+            "published": published,
+            "primary_category": get("primary_category", ""),
+            "categories": categories_list,
+            "pdf_url": get("pdf_url", ""),
             "abs_url": abs_url,
-            "comment": paper.get("comment", ""),
-            "journal_ref": paper.get("journal_ref", ""),
-            "doi": paper.get("doi", ""),
+            "comment": get("comment", ""),
+            "journal_ref": get("journal_ref", ""),
+            "doi": get("doi", ""),
         })
 
-    papers_text = "\n".join(papers_lines)
+    return "\n".join(papers_lines), top_papers
+
+
+def _new_citations(top_papers: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Build citation entries for analyzed papers, keyed by arxiv_id.
     
-    prompt = f"""
-    You are a research agent evaluating arXiv papers for: {topic}
-
-    Query used: {query}
-
-    Papers found:
-    {papers_text}
-
-    Provide a DETAILED analysis of these research papers. Focus on:
-    - Key research contributions, methodologies, and techniques
-    - Specific experimental results, metrics, or benchmarks
-    - Novel approaches, architectures, or algorithms proposed
-    - Connections between papers and emerging research themes
-    - Identified research gaps or open problems
-    - Practical applications and potential impact
-    - Most influential or highly relevant papers for this topic
-
-    Return JSON with:
-    - "insights": String array of specific, technical insights from the papers
-    - "relevance_score": Number 1-10 (how relevant are these papers to the research topic)
-    - "summary": Brief summary of the research landscape
-    - "key_points": Array of most important research findings
-    - "research_gaps": Array of identified gaps or future research directions
+    The orchestrator assigns citation numbers as it merges these into its
+    citation registry, so synthesis only has to format them.
+    """
+    citations = {}
+    for paper in top_papers:
+        arxiv_id = paper["arxiv_id"]
+        if not arxiv_id or arxiv_id in citations:
+            continue
+        authors = paper["authors"]
+        author_str = authors[0] if authors else "Unknown"
+        if len(authors) > 1:
+            author_str += " et al."
+        citations[arxiv_id] = {
+            "title": paper["title"] or "Unknown",
+            "authors": author_str,
+            "abs_url": paper["abs_url"],
+            "pdf_url": paper["pdf_url"],
+            "published": paper["published"][:10],
+            "categories": paper["categories"],
+        }
+    return citations
+
+
+def analyze_papers_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity: Analyze arXiv papers and extract academic insights using LLM.
+    
+    Args:
+        ctx: Activity context
+        input: Dictionary with topic, query, and papers
+        
+    Returns:
+        Analysis result as dictionary
     """
+    topic = input["topic"]
+    query = input["query"]
+    papers = input["papers"][:MAX_PAPERS_TO_ANALYZE]
+    
+    if not papers:
+        logger.info(f"No papers to analyze for query: {query}")
+        return _empty_analysis(query, "No papers found for this query")
+    
+    logger.info(f"Analyzing papers for topic: {topic}, query: {query}")
+
+    # Create detailed content digest for LLM
+    papers_text, top_papers = _build_papers_digest(papers)
     
     messages = [
-        {
-            "role": "system",
-            "content": "You are a research evaluation agent. Analyze arXiv papers and provide structured insights in JSON format. Focus on technical depth and research value.",
-        },
-        {"role": "user", "content": prompt},
+        {"role": "system", "content": _ANALYZE_SYSTEM_INSTRUCTIONS},
+        {"role": "user", "content": f"Topic: {topic}\nQuery: {query}\n\nPapers:\n{papers_text}"},
     ]
     
-    response = call_llm(messages, max_tokens=2000)
+    # No semantic cache: the papers come after the topic and query, past what the
+    # embedding model reads, so different paper sets would match each other
+    response = call_llm(messages, max_tokens=2000, use_semantic_cache=False)
     try:
         evaluation_dict = parse_json_response(response)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning(f"Failed to parse evaluation JSON: {e}, using defaults")
-        evaluation_dict = {
-            "insights": [],
-            "relevance_score": 5,
-            "summary": "Failed to parse LLM response",
-            "key_points": [],
-            "research_gaps": [],
-        }
+        evaluation_dict = _empty_analysis(query, "Failed to parse LLM response", relevance_score=5)
     evaluation_dict["query"] = query
     evaluation_dict["top_papers"] = top_papers
+    evaluation_dict["new_citations"] = _new_citations(top_papers)
 
     return evaluation_dict
 
 
-def identify_research_gaps_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> Optional[str]:
+def identify_research_gaps_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> List[str]:
     """Activity: Identify research gaps and generate follow-up queries.
     
     Args:
@@ -155,7 +349,7 @@ def identify_research_gaps_activity(ctx: task.ActivityContext, input: Dict[str,
         input: Dictionary with topic, current_findings, and iteration
         
     Returns:
-        Next query to research, or None if no gaps identified
+        Follow-up queries to research, or an empty list if no gaps identified
     """
     topic = input["topic"]
     current_findings = input["current_findings"]
@@ -173,44 +367,26 @@ def identify_research_gaps_activity(ctx: task.ActivityContext, input: Dict[str,
         )
     findings_summary = "\n\n".join(findings_lines)
     
-    prompt = f"""
-    You are a research agent investigating: {topic}
-    
-    This is iteration {iteration} of your research.
-    
-    Current findings:
-    {findings_summary}
-    
-    Generate 2-4 SHORT KEYWORD-BASED search queries for arXiv that explore DIVERSE aspects of {topic}.
-    
-    CRITICAL RULES:
-    1. Use SHORT keywords (2-5 words max) - NOT long sentences
-    2. Focus on DIFFERENT aspects, methodologies, or applications
-    3. Use terms that appear in actual arXiv paper titles
-    4. Consider exploring identified research gaps
-    5. Avoid repeating previous queries
-    
-    GOOD examples: ["transformer attention mechanisms", "neural network pruning", "federated learning privacy"]
-    BAD examples: ["What are the latest advances in transformer-based architectures for natural language processing?"]
-    
-    Return only a JSON array of SHORT keyword queries: ["query1", "query2", "query3"]
-    """
-    
     messages = [
+        {"role": "system", "content": _GAPS_SYSTEM_INSTRUCTIONS},
         {
-            "role": "system",
-            "content": "You are a research agent. Generate focused follow-up queries for arXiv search. Return only JSON array.",
+            "role": "user",
+            "content": f"Topic: {topic}\n\nCurrent findings:\n{findings_summary}\n\nIteration: {iteration}",
         },
-        {"role": "user", "content": prompt},
     ]
     
-    response = call_llm(messages)
+    # Never reuse cached queries: they depend on the iteration, and findings from
+    # different iterations look alike to the embedding model, so a semantic hit
+    # would repeat an earlier iteration's follow-up queries
+    response = call_llm(messages, use_semantic_cache=False)
     try:
         queries = parse_json_response(response)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning(f"Failed to parse follow-up queries JSON: {e}")
         queries = []
-    return queries[0] if isinstance(queries, list) and queries else None
+    if not isinstance(queries, list):
+        return []
+    return [q.strip() for q in queries if isinstance(q, str) and q.strip()]
 
 
 def decide_continuation_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> bool:
@@ -248,44 +424,36 @@ def decide_continuation_activity(ctx: task.ActivityContext, input: Dict[str, Any
     findings_summary = "\n\n".join(findings_lines)
 
     avg_relevance = total_relevance / len(all_findings) if all_findings else 0
-    
-    prompt = f"""
-    You are a research agent investigating: {topic}
-    
-    Current iteration: {current_iteration}/{max_iterations}
-    
-    Findings so far:
-    {findings_summary}
-    
-    Average relevance score: {avg_relevance:.1f}/10
-    
-    Decide whether to continue research or conclude. Continue if:
-    1. Current iteration is less than 75% of max_iterations
-    2. Average relevance is above 6.0 and there are likely unexplored aspects
-    3. Recent queries found significant new papers with valuable insights
-    4. There are identified research gaps worth exploring
-    
-    Only stop early if:
-    - Average relevance is below 5.0 for multiple iterations
-    - No new meaningful information in the last 2 iterations
-    - The topic has been comprehensively covered
-    
-    Return JSON with:
-    - "should_continue": boolean
-    """
+
+    # Clear-cut cases are decided by rule; only ambiguous ones go to the LLM
+    if current_iteration < max_iterations * 0.25:
+        logger.info("Early iteration, continuing without LLM decision")
+        return True
+    if avg_relevance >= 8.0 and current_iteration < max_iterations * 0.75:
+        logger.info(f"High relevance ({avg_relevance:.1f}), continuing without LLM decision")
+        return True
+    if len(all_findings) >= 2 and avg_relevance < 4.0:
+        logger.info(f"Low relevance ({avg_relevance:.1f}), stopping without LLM decision")
+        return False
     
     messages = [
+        {"role": "system", "content": _DECIDE_SYSTEM_INSTRUCTIONS},
         {
-            "role": "system",
-            "content": "You are a research decision agent. Evaluate research completeness and decide whether to continue. Return JSON.",
+            "role": "user",
+            "content": (
+                f"Topic: {topic}\n\n"
+                f"Findings so far:\n{findings_summary}\n\n"
+                f"Current iteration: {current_iteration}/{max_iterations}\n"
+                f"Average relevance score: {avg_relevance:.1f}/10"
+            ),
         },
-        {"role": "user", "content": prompt},
     ]
     
-    raw_response = call_llm(messages)
+    # Never reuse a cached decision: it depends on the iteration counter
+    raw_response = call_llm(messages, use_semantic_cache=False)
     try:
         json_response = parse_json_response(raw_response)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning(f"Failed to parse should_continue JSON: {e}, defaulting to False")
         json_response = {}
     return json_response.get("should_continue", False)
@@ -296,101 +464,92 @@ def synthesize_research_activity(ctx: task.ActivityContext, input: Dict[str, Any
     
     Args:
         ctx: Activity context
-        input: Dictionary with topic and all_findings
+        input: Dictionary with topic, all_findings, and citations (arxiv_id ->
+               numbered citation entry)
         
     Returns:
         Final research report as a string
     """
     topic = input["topic"]
     all_findings = input["all_findings"]
+    citations = input.get("citations", {})
     
     logger.info(f"Synthesizing findings for topic: {topic}")
     
-    findings_text = ""
-    paper_citations = {}
-    citation_id = 1
-    
+    findings_parts = []
     for i, finding in enumerate(all_findings, 1):
-        findings_text += f"\n=== Finding {i} ===\n"
-        findings_text += f"Query: {finding.get('query', 'Unknown')}\n"
-        findings_text += f"Summary: {finding.get('summary', 'No summary')}\n"
-        findings_text += f"Key Points: {finding.get('key_points', [])}\n"
-        findings_text += f"Insights: {finding.get('insights', [])}\n"
-        findings_text += f"Research Gaps: {finding.get('research_gaps', [])}\n"
-        
-        # Extract paper citations
-        if finding.get("top_papers"):
-            for paper in finding["top_papers"]:
-                arxiv_id = paper.get("arxiv_id", "")
-                if arxiv_id and arxiv_id not in paper_citations:
-                    authors = paper.get("authors", [])
-                    author_str = authors[0] if authors else "Unknown"
-                    if len(authors) > 1:
-                        author_str += " et al."
-                    paper_citations[arxiv_id] = {
-                        "id": citation_id,
-                        "title": paper.get("title", "Unknown"),
-                        "authors": author_str,
-                        "abs_url": paper.get("abs_url", ""),
-                        "pdf_url": paper.get("pdf_url", ""),
-                        "published": paper.get("published", "")[:10],
-                        "categories": paper.get("categories", []),
-                    }
-                    citation_id += 1
-    
-    # Create citation references
-    citations_text = "\n".join([
-        f"[{cite['id']}] {cite['authors']}: \"{cite['title']}\" ({cite['published']}) - {cite['abs_url']}"
-        for cite in paper_citations.values()
-    ])
-    
-    prompt = f"""
-    You are a research analyst. Synthesize the following arXiv research findings into a comprehensive,
-    detailed report about: {topic}
-    
-    Research Findings:
-    {findings_text}
+        findings_parts.append(
+            f"\n=== Finding {i} ===\n"
+            f"Query: {finding.get('query', 'Unknown')}\n"
+            f"Summary: {finding.get('summary', 'No summary')}\n"
+            f"Key Points: {finding.get('key_points', [])}\n"
+            f"Insights: {finding.get('insights', [])}\n"
+            f"Research Gaps: {finding.get('research_gaps', [])}\n"
+        )
+    findings_text = "".join(findings_parts)
 
-    Available Paper Citations:
-    {citations_text}
-    
-    Create a comprehensive research report that flows naturally as a single narrative. Include:
-    - Overview of the research landscape and current state of the field
-    - Key methodologies, techniques, and approaches in the literature
-    - Important experimental results, benchmarks, and comparisons
-    - Emerging trends and research directions
-    - Identified gaps and opportunities for future research
-    - Practical implications and applications
-    - INLINE LINKS: When referencing papers, include clickable links using [paper title](URL) format
-    
-    Structure the report with clear sections:
-    1. Executive Summary
-    2. Research Landscape Overview
-    3. Key Findings and Methodologies
-    4. Emerging Trends
-    5. Research Gaps and Future Directions
-    6. Conclusions
-    
-    Return a JSON object with this exact structure:
-    {{
-        "report": "A comprehensive research report..."
-    }}
-    """
+    # Citations were numbered by the orchestrator in discovery order
+    citations_text = "\n".join(
+        f"[{cite['id']}] {cite['authors']}: \"{cite['title']}\" ({cite['published']}) - {cite['abs_url']}"
+        for cite in citations.values()
+    )
     
     messages = [
+        {"role": "system", "content": _SYNTHESIZE_SYSTEM_INSTRUCTIONS},
         {
-            "role": "system",
-            "content": "You are a research analyst specializing in academic literature review. Provide comprehensive synthesis in JSON format.",
+            "role": "user",
+            "content": (
+                f"Topic: {topic}\n\n"
+                f"Research Findings:\n{findings_text}\n\n"
+                f"Available Paper Citations:\n{citations_text}"
+            ),
         },
-        {"role": "user", "content": prompt},
     ]
     
-    raw_response = call_llm(messages, max_tokens=3000)
-    try:
-        json_response = parse_json_response(raw_response)
-        return json_response.get("report", "No report generated")
-    except json.JSONDecodeError as e:
-        logger.warning(f"Failed to parse synthesis JSON: {e}, returning raw response")
-        # If JSON parsing fails, return the raw response as the report
-        # (LLM may have returned plain text instead of JSON)
-        return raw_response
+    # The report is requested as plain Markdown rather than a JSON string field:
+    # the model doesn't spend output tokens escaping it, and the largest
+    # response of the run never has to be parsed
+    report = call_llm(messages, max_tokens=3000, json_output=False).strip()
+    return report or "No report generated"
+
+
+def merge_analyses_activity(ctx: task.ActivityContext, input: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity: Merge analyses of one query's paper chunks into a single result.
+    
+    Insights, key points, and research gaps are concatenated without
+    duplicates, and the relevance score is averaged weighted by how many
+    papers each chunk analyzed. Chunks with no papers are ignored.
+    
+    Args:
+        ctx: Activity context
+        input: Dictionary with query and analyses (results of
+               analyze_papers_activity for each chunk)
+        
+    Returns:
+        Merged analysis result with the same shape as analyze_papers_activity's
+    """
+    query = input["query"]
+    partials = [a for a in input["analyses"] if a.get("top_papers")]
+    if not partials:
+        return _empty_analysis(query, "No new papers found for this query")
+
+    logger.info(f"Merging {len(partials)} partial analyses for query: {query}")
+
+    merged = _empty_analysis(
+        query, " ".join(a["summary"] for a in partials if a.get("summary"))
+    )
+    merged["new_citations"] = {}
+    weighted_relevance = 0
+    paper_count = 0
+    for analysis in partials:
+        for key in ("insights", "key_points", "research_gaps"):
+            items = merged[key]
+            items.extend(item for item in analysis.get(key, []) if item not in items)
+        papers = analysis["top_papers"]
+        weighted_relevance += analysis.get("relevance_score", 5) * len(papers)
+        paper_count += len(papers)
+        merged["top_papers"].extend(papers)
+        merged["new_citations"].update(analysis.get("new_citations", {}))
+
+    merged["relevance_score"] = round(weighted_relevance / paper_count)
+    return merged
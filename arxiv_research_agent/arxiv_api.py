@@ -1,70 +1,163 @@
 """arXiv API utilities for searching papers and retrieving metadata."""
 
+import atexit
+import copy
+import hashlib
+import io
+import json
 import logging
+import os
+import random
 import re
+import tempfile
+import threading
 import time
-import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import httpx
+import lxml.etree as LET
 
 logger = logging.getLogger(__name__)
 
 # arXiv API configuration
 ARXIV_API_URL = "https://export.arxiv.org/api/query"
 API_TIMEOUT = 60.0  # arXiv API can be slow, use longer timeout
+USER_AGENT = "arxiv-research-agent/0.1.0 (+https://github.com/torosent/arXiv_research_agent)"
+
+# Accepted sortBy / sortOrder values
+SORT_BY_VALUES = ("relevance", "lastUpdatedDate", "submittedDate")
+SORT_ORDER_VALUES = ("ascending", "descending")
+
+# Query parameters shared by every search request; each call overrides what varies
+_SEARCH_PARAMS = MappingProxyType({
+    "start": 0,
+    "sortBy": "relevance",
+    "sortOrder": "descending",
+})
+
+# Most results a single search request may ask for
+MAX_RESULTS_PER_REQUEST = 100
+
+# Words ignored when matching combined-search results back to their queries
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "based", "by", "for", "from", "in",
+    "into", "is", "of", "on", "or", "the", "to", "using", "via", "with",
+})
+_WORD_RE = re.compile(r"\w+")
+
+# Seconds an idle pooled connection to arXiv is kept open for reuse
+KEEPALIVE_EXPIRY = 60.0
 
 # Rate limiting: arXiv recommends no more than 1 request per 3 seconds
 RATE_LIMIT_DELAY = 3.0  # seconds between requests
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 5.0  # base seconds for exponential backoff on 429
+RETRY_JITTER = 0.5  # backoff is stretched by a random 0-50% so parallel retries spread out
+
+# Earliest monotonic time at which the next request may start. Each caller
+# reserves the next slot under the lock and then sleeps outside it, so concurrent
+# activities queue in order without serializing each other's HTTP calls.
+_next_allowed_time: float = 0.0
+_rate_limit_lock = threading.Lock()
+
+# Optional on-disk cache of raw feed responses, enabled by setting ARXIV_CACHE_DIR.
+# Relevance-ranked results change slowly; date-sorted results pick up new
+# submissions, so they expire sooner. Stale entries are revalidated with
+# If-None-Match / If-Modified-Since when the server provided validators.
+CACHE_TTL_RELEVANCE = 24 * 3600.0
+CACHE_TTL_BY_DATE = 3600.0
 
-# Track last request time for rate limiting
-_last_request_time: float = 0.0
+# How long get_paper_by_id results are memoized in memory
+PAPER_CACHE_TTL = 3600
 
 # Shared httpx client with connection pooling for efficiency
 _http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
 
 
 def _get_client() -> httpx.Client:
-    """Get or create shared httpx client with connection pooling."""
+    """Get or create shared httpx client with connection pooling.
+
+    The client is created once per process, so activities running on the
+    worker's thread pool reuse its TCP/TLS connections; it is closed at exit.
+    """
     global _http_client
     if _http_client is None:
-        _http_client = httpx.Client(
-            timeout=API_TIMEOUT,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-        )
+        with _http_client_lock:
+            if _http_client is None:
+                # HTTP/2 multiplexes concurrent queries over one connection and
+                # compresses headers; httpx requests gzip-encoded responses by default.
+                # Searches are spaced by the rate limit and by LLM work in between,
+                # so idle connections are kept longer than httpx's 5s default.
+                _http_client = httpx.Client(
+                    http2=True,
+                    timeout=API_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=5,
+                        max_connections=10,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                    headers={"User-Agent": USER_AGENT},
+                )
+                atexit.register(_close_client)
     return _http_client
 
 
-def _rate_limited_request(client: httpx.Client, url: str, params: dict) -> httpx.Response:
-    """Make a rate-limited request with retry logic for 429/503 errors."""
-    global _last_request_time
+def _close_client() -> None:
+    """Close the shared httpx client, if one was created."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def _wait_for_rate_limit() -> None:
+    """Block until the next request is allowed by the rate limit."""
+    global _next_allowed_time
+    
+    with _rate_limit_lock:
+        now = time.monotonic()
+        sleep_time = max(0.0, _next_allowed_time - now)
+        _next_allowed_time = max(now, _next_allowed_time) + RATE_LIMIT_DELAY
     
+    if sleep_time > 0:
+        logger.debug(f"Rate limiting: sleeping {sleep_time:.1f}s")
+        time.sleep(sleep_time)
+
+
+def _retry_backoff(attempt: int) -> float:
+    """Seconds to wait before retrying, exponential in attempt with random jitter."""
+    return RETRY_BACKOFF_BASE * (2 ** attempt) * random.uniform(1.0, 1.0 + RETRY_JITTER)
+
+
+def _rate_limited_request(
+    client: httpx.Client,
+    url: str,
+    params: dict,
+    headers: Optional[dict] = None,
+) -> httpx.Response:
+    """Make a rate-limited request with retry logic for 429/503 errors."""
     response: Optional[httpx.Response] = None
     
     for attempt in range(MAX_RETRIES):
         # Enforce rate limit
-        elapsed = time.time() - _last_request_time
-        if elapsed < RATE_LIMIT_DELAY:
-            sleep_time = RATE_LIMIT_DELAY - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        
-        _last_request_time = time.time()
-        response = client.get(url, params=params)
+        _wait_for_rate_limit()
+        response = client.get(url, params=params, headers=headers)
         
         if response.status_code == 429:
             # Too Many Requests - exponential backoff
-            backoff = RETRY_BACKOFF_BASE * (2 ** attempt)
-            logger.warning(f"arXiv rate limit hit (429), retrying in {backoff}s (attempt {attempt + 1}/{MAX_RETRIES})")
+            backoff = _retry_backoff(attempt)
+            logger.warning(f"arXiv rate limit hit (429), retrying in {backoff:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
             time.sleep(backoff)
             continue
         
         if response.status_code == 503:
             # Service Unavailable - exponential backoff
-            backoff = RETRY_BACKOFF_BASE * (2 ** attempt)
-            logger.warning(f"arXiv service unavailable (503), retrying in {backoff}s (attempt {attempt + 1}/{MAX_RETRIES})")
+            backoff = _retry_backoff(attempt)
+            logger.warning(f"arXiv service unavailable (503), retrying in {backoff:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
             time.sleep(backoff)
             continue
         
@@ -75,12 +168,128 @@ def _rate_limited_request(client: httpx.Client, url: str, params: dict) -> httpx
         return response
     raise ArxivAPIError("Max retries exceeded")
 
+
+def _cache_path(params: Dict[str, Any]) -> Optional[str]:
+    """Return the cache file path for a query, if caching is enabled."""
+    cache_dir = os.environ.get("ARXIV_CACHE_DIR")
+    if not cache_dir:
+        return None
+    key = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()
+    return os.path.join(os.path.expanduser(cache_dir), f"{key}.feed")
+
+
+def _cache_ttl(params: Dict[str, Any]) -> float:
+    """Return how long a cached response for the query stays fresh."""
+    if params.get("sortBy") in ("submittedDate", "lastUpdatedDate"):
+        return CACHE_TTL_BY_DATE
+    return CACHE_TTL_RELEVANCE
+
+
+def _load_cached_feed(path: str) -> Optional[Dict[str, Any]]:
+    """Load a cached feed body and its metadata, or None if absent or unreadable.
+
+    A cache file holds one line of JSON metadata followed by the raw feed body.
+    """
+    try:
+        with open(path, "rb") as f:
+            header, _, content = f.read().partition(b"\n")
+        meta = json.loads(header)
+        meta["content"] = content
+        return meta
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_feed(
+    path: str,
+    content: bytes,
+    etag: Optional[str],
+    last_modified: Optional[str],
+) -> None:
+    """Write a feed body and its metadata to the cache (best effort)."""
+    meta = {"fetched_at": time.time(), "etag": etag, "last_modified": last_modified}
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Metadata and body go in one file, written under a unique temp name and
+        # renamed into place, so concurrent writers (in this or another worker
+        # process) never interleave and readers never see a partial or
+        # mismatched entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Failed to write arXiv response cache: {e}")
+
+
+def _get_feed(client: httpx.Client, params: Dict[str, Any]) -> bytes:
+    """Fetch the raw feed for a query, serving it from the disk cache when fresh.
+
+    Raises:
+        httpx.HTTPStatusError: If the API returns an error status
+    """
+    path = _cache_path(params)
+    cached = _load_cached_feed(path) if path else None
+    if cached and time.time() - cached["fetched_at"] < _cache_ttl(params):
+        logger.debug("arXiv response cache hit")
+        return cached["content"]
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = _rate_limited_request(client, ARXIV_API_URL, params, headers=headers or None)
+    if cached and response.status_code == 304:
+        logger.debug("arXiv response cache revalidated")
+        _store_cached_feed(path, cached["content"], cached.get("etag"), cached.get("last_modified"))
+        return cached["content"]
+
+    response.raise_for_status()
+    if path:
+        _store_cached_feed(
+            path,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+    return response.content
+
+
 # XML namespaces used by arXiv API
 NAMESPACES = {
     "atom": "http://www.w3.org/2005/Atom",
     "arxiv": "http://arxiv.org/schemas/atom",
 }
 
+# Clark-notation tag of a feed entry, used to stream entries with iterparse
+_ENTRY_TAG = "{http://www.w3.org/2005/Atom}entry"
+_LINK_TAG = "{http://www.w3.org/2005/Atom}link"
+
+# Precompiled whitespace pattern for _clean_text
+_WS_RE = re.compile(r"\s+")
+
+# Precompiled XPath expressions for entry fields (compiled once, reused per entry)
+_XP_ID = LET.XPath("string(atom:id)", namespaces=NAMESPACES)
+_XP_TITLE = LET.XPath("string(atom:title)", namespaces=NAMESPACES)
+_XP_SUMMARY = LET.XPath("string(atom:summary)", namespaces=NAMESPACES)
+_XP_AUTHORS = LET.XPath("atom:author/atom:name/text()", namespaces=NAMESPACES)
+_XP_PUBLISHED = LET.XPath("string(atom:published)", namespaces=NAMESPACES)
+_XP_UPDATED = LET.XPath("string(atom:updated)", namespaces=NAMESPACES)
+_XP_CATEGORIES = LET.XPath("atom:category/@term", namespaces=NAMESPACES)
+_XP_PRIMARY_CATEGORY = LET.XPath("string(arxiv:primary_category/@term)", namespaces=NAMESPACES)
+_XP_COMMENT = LET.XPath("string(arxiv:comment)", namespaces=NAMESPACES)
+_XP_JOURNAL_REF = LET.XPath("string(arxiv:journal_ref)", namespaces=NAMESPACES)
+_XP_DOI = LET.XPath("string(arxiv:doi)", namespaces=NAMESPACES)
+
 
 class ArxivAPIError(Exception):
     """Exception raised when arXiv API calls fail."""
@@ -91,10 +300,36 @@ def _clean_text(text: Optional[str]) -> str:
     """Clean text by removing extra whitespace and newlines."""
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', text.strip())
+    return _WS_RE.sub(" ", text.strip())
+
+
+def _parse_links(entry: LET._Element) -> Tuple[str, str]:
+    """Extract the PDF and abstract page URLs from an entry's links.
+    
+    A single pass over the link children, stopping once both are found, is
+    cheaper than evaluating two XPath expressions per entry.
+    
+    Args:
+        entry: XML element representing an arXiv entry
+        
+    Returns:
+        Tuple of (pdf_url, abs_url); either may be empty
+    """
+    pdf_url = ""
+    abs_url = ""
+    for link in entry.iterchildren(_LINK_TAG):
+        attrs = link.attrib
+        if attrs.get("title") == "pdf" or attrs.get("type") == "application/pdf":
+            if not pdf_url:
+                pdf_url = attrs.get("href", "")
+        elif attrs.get("rel") == "alternate" and not abs_url:
+            abs_url = attrs.get("href", "")
+        if pdf_url and abs_url:
+            break
+    return pdf_url, abs_url
 
 
-def _parse_entry(entry: ET.Element) -> Dict[str, Any]:
+def _parse_entry(entry: LET._Element) -> Dict[str, Any]:
     """Parse an arXiv entry element into a dictionary.
     
     Args:
@@ -104,97 +339,123 @@ def _parse_entry(entry: ET.Element) -> Dict[str, Any]:
         Dictionary with paper metadata
     """
     # Extract arxiv ID from the id URL
-    id_elem = entry.find("atom:id", NAMESPACES)
-    arxiv_id = ""
-    if id_elem is not None and id_elem.text:
-        # ID format: http://arxiv.org/abs/2301.12345v1
-        arxiv_id = id_elem.text.split("/abs/")[-1] if "/abs/" in id_elem.text else id_elem.text
-    
-    # Title
-    title_elem = entry.find("atom:title", NAMESPACES)
-    title = _clean_text(title_elem.text if title_elem is not None else "")
-    
-    # Summary/Abstract
-    summary_elem = entry.find("atom:summary", NAMESPACES)
-    summary = _clean_text(summary_elem.text if summary_elem is not None else "")
+    # ID format: http://arxiv.org/abs/2301.12345v1
+    id_text = _XP_ID(entry)
+    # (rpartition returns the whole text when there is no "/abs/")
+    arxiv_id = id_text.rpartition("/abs/")[2]
     
     # Authors
-    authors = []
-    for author in entry.findall("atom:author", NAMESPACES):
-        name_elem = author.find("atom:name", NAMESPACES)
-        if name_elem is not None and name_elem.text:
-            authors.append(name_elem.text.strip())
-    
-    # Published date
-    published_elem = entry.find("atom:published", NAMESPACES)
-    published = published_elem.text if published_elem is not None else ""
-    
-    # Updated date
-    updated_elem = entry.find("atom:updated", NAMESPACES)
-    updated = updated_elem.text if updated_elem is not None else ""
+    authors = [name.strip() for name in _XP_AUTHORS(entry) if name.strip()]
     
     # Categories
-    categories = []
-    for category in entry.findall("atom:category", NAMESPACES):
-        term = category.get("term")
-        if term:
-            categories.append(term)
-    
-    # Primary category
-    primary_category_elem = entry.find("arxiv:primary_category", NAMESPACES)
-    primary_category = ""
-    if primary_category_elem is not None:
-        primary_category = primary_category_elem.get("term", "")
-    
-    # Links
-    pdf_url = ""
-    abs_url = ""
-    for link in entry.findall("atom:link", NAMESPACES):
-        link_type = link.get("type", "")
-        link_title = link.get("title", "")
-        href = link.get("href", "")
-        
-        if link_title == "pdf" or link_type == "application/pdf":
-            pdf_url = href
-        elif link.get("rel") == "alternate":
-            abs_url = href
-    
-    # Comment (often contains page count, conference info, etc.)
-    comment_elem = entry.find("arxiv:comment", NAMESPACES)
-    comment = _clean_text(comment_elem.text if comment_elem is not None else "")
+    categories = [term for term in _XP_CATEGORIES(entry) if term]
     
-    # Journal reference
-    journal_elem = entry.find("arxiv:journal_ref", NAMESPACES)
-    journal_ref = _clean_text(journal_elem.text if journal_elem is not None else "")
-    
-    # DOI
-    doi_elem = entry.find("arxiv:doi", NAMESPACES)
-    doi = doi_elem.text.strip() if doi_elem is not None and doi_elem.text else ""
+    pdf_url, abs_url = _parse_links(entry)
     
     return {
         "arxiv_id": arxiv_id,
-        "title": title,
-        "summary": summary,
+        "title": _clean_text(_XP_TITLE(entry)),
+        "summary": _clean_text(_XP_SUMMARY(entry)),
         "authors": authors,
-        "published": published,
-        "updated": updated,
+        "published": _XP_PUBLISHED(entry),
+        "updated": _XP_UPDATED(entry),
         "categories": categories,
-        "primary_category": primary_category,
+        "primary_category": _XP_PRIMARY_CATEGORY(entry),
         "pdf_url": pdf_url,
         "abs_url": abs_url or f"https://arxiv.org/abs/{arxiv_id}",
-        "comment": comment,
-        "journal_ref": journal_ref,
-        "doi": doi,
+        # Comment often contains page count, conference info, etc.
+        "comment": _clean_text(_XP_COMMENT(entry)),
+        "journal_ref": _clean_text(_XP_JOURNAL_REF(entry)),
+        "doi": _XP_DOI(entry).strip(),
     }
 
 
-def search_arxiv(
+def _iter_feed(content: bytes) -> Iterator[Dict[str, Any]]:
+    """Lazily parse an arXiv Atom feed into paper dictionaries.
+    
+    Entries are streamed with lxml's iterparse and cleared once parsed, so
+    memory stays bounded to a single entry regardless of feed size, and entries
+    the caller never consumes are never parsed.
+    
+    Args:
+        content: Raw XML response body
+        
+    Yields:
+        Paper dictionaries with metadata, in feed order
+    """
+    for _, entry in LET.iterparse(io.BytesIO(content), events=("end",), tag=_ENTRY_TAG):
+        yield _parse_entry(entry)
+        # Clearing empties the entry, but the emptied element stays attached to
+        # the feed root; drop earlier siblings too so the tree doesn't grow
+        entry.clear()
+        while entry.getprevious() is not None:
+            del entry.getparent()[0]
+
+
+def _iter_papers(params: Dict[str, Any], description: str) -> Iterator[Dict[str, Any]]:
+    """Query the arXiv API and lazily parse the returned feed.
+    
+    The request is made when iteration starts.
+    
+    Args:
+        params: Query parameters for the arXiv API
+        description: What is being fetched, used in log messages
+        
+    Yields:
+        Paper dictionaries with metadata
+        
+    Raises:
+        ArxivAPIError: If the API request fails
+    """
+    try:
+        content = _get_feed(_get_client(), params)
+        
+        # Parse XML response. This runs on the calling activity's worker thread
+        # after the rate-limit lock is released, so it overlaps with other
+        # activities' rate-limit waits and requests rather than blocking them.
+        yield from _iter_feed(content)
+            
+    except httpx.TimeoutException as e:
+        logger.error(f"Timeout {description}: {e}")
+        raise ArxivAPIError(f"Request timed out: {e}") from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error {description}: {e}")
+        raise ArxivAPIError(f"HTTP error: {e.response.status_code}") from e
+    except httpx.RequestError as e:
+        logger.error(f"Network error {description}: {e}")
+        raise ArxivAPIError(f"Network error: {e}") from e
+    except LET.XMLSyntaxError as e:
+        logger.error(f"Failed to parse arXiv API response: {e}")
+        raise ArxivAPIError(f"Invalid API response: {e}") from e
+
+
+def _fetch_papers(params: Dict[str, Any], description: str) -> List[Dict[str, Any]]:
+    """Query the arXiv API and parse the whole returned feed.
+    
+    Args:
+        params: Query parameters for the arXiv API
+        description: What is being fetched, used in log messages
+        
+    Returns:
+        List of paper dictionaries with metadata
+        
+    Raises:
+        ArxivAPIError: If the API request fails
+    """
+    return list(_iter_papers(params, description))
+
+
+def search_arxiv_iter(
     query: str,
     max_results: int = 30,
     sort_by: str = "relevance",
     sort_order: str = "descending"
-) -> List[Dict[str, Any]]:
-    """Search arXiv for papers matching the query.
+) -> Iterator[Dict[str, Any]]:
+    """Search arXiv for papers matching the query, parsing results lazily.
+    
+    Parameters are validated immediately; the request is made when iteration
+    starts, and each entry is parsed only when it is consumed, so callers that
+    need just the first few papers can stop early with itertools.islice.
     
     Args:
         query: Search query string (supports arXiv query syntax)
@@ -203,10 +464,10 @@ def search_arxiv(
         sort_order: Sort order - "ascending" or "descending"
         
     Returns:
-        List of paper dictionaries with metadata
+        Iterator over paper dictionaries with metadata
         
     Raises:
-        ArxivAPIError: If the API request fails
+        ArxivAPIError: If the API request fails (during iteration)
         ValueError: If parameters are invalid
     """
     if not 1 <= max_results <= 100:
@@ -214,48 +475,112 @@ def search_arxiv(
 
     if not query or not query.strip():
         raise ValueError("query cannot be empty")
-    
-    if sort_by not in ["relevance", "lastUpdatedDate", "submittedDate"]:
+
+    if sort_by not in SORT_BY_VALUES:
         raise ValueError("sort_by must be 'relevance', 'lastUpdatedDate', or 'submittedDate'")
 
-    if sort_order not in ["ascending", "descending"]:
+    if sort_order not in SORT_ORDER_VALUES:
         raise ValueError("sort_order must be 'ascending' or 'descending'")
     
     params = {
+        **_SEARCH_PARAMS,
         "search_query": f"all:{query.strip()}",
-        "start": 0,
         "max_results": max_results,
         "sortBy": sort_by,
         "sortOrder": sort_order,
     }
     
-    try:
-        client = _get_client()
-        response = _rate_limited_request(client, ARXIV_API_URL, params)
-        response.raise_for_status()
+    return _iter_papers(params, f"searching arXiv for '{query}'")
+
+
+def search_arxiv(
+    query: str,
+    max_results: int = 30,
+    sort_by: str = "relevance",
+    sort_order: str = "descending"
+) -> List[Dict[str, Any]]:
+    """Search arXiv for papers matching the query.
+    
+    Args:
+        query: Search query string (supports arXiv query syntax)
+        max_results: Maximum number of results to return (1-100)
+        sort_by: Sort field - "relevance", "lastUpdatedDate", or "submittedDate"
+        sort_order: Sort order - "ascending" or "descending"
+        
+    Returns:
+        List of paper dictionaries with metadata
         
-        # Parse XML response
-        root = ET.fromstring(response.text)
+    Raises:
+        ArxivAPIError: If the API request fails
+        ValueError: If parameters are invalid
+    """
+    return list(search_arxiv_iter(query, max_results, sort_by, sort_order))
+
+
+def _query_keywords(query: str) -> frozenset:
+    """Return the words of a query used to match papers to it.
+    
+    Stopwords are dropped unless the query has nothing else.
+    """
+    words = set(_WORD_RE.findall(query.lower()))
+    return frozenset(words - _STOPWORDS or words)
+
+
+def search_arxiv_multi(
+    queries: List[str],
+    per_query: int = 30
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Search arXiv for several queries with a single API request.
+    
+    The queries are combined into one boolean OR query, so only one
+    rate-limited round-trip is made; the request asks for at most
+    MAX_RESULTS_PER_REQUEST papers. Results are then partitioned client-side:
+    each paper is assigned to the one query whose keywords (whole words, minus
+    stopwords) appear most in its title and summary, the earliest query
+    winning ties.
+    
+    Args:
+        queries: Search query strings
+        per_query: Maximum number of papers to return per query (1-100)
         
-        papers = []
-        for entry in root.findall("atom:entry", NAMESPACES):
-            paper = _parse_entry(entry)
-            papers.append(paper)
+    Returns:
+        Dictionary mapping each query to its list of paper dictionaries
         
-        return papers
-            
-    except httpx.TimeoutException as e:
-        logger.error(f"Timeout searching arXiv for '{query}': {e}")
-        raise ArxivAPIError(f"Request timed out: {e}") from e
-    except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error searching arXiv: {e}")
-        raise ArxivAPIError(f"HTTP error: {e.response.status_code}") from e
-    except httpx.RequestError as e:
-        logger.error(f"Network error searching arXiv: {e}")
-        raise ArxivAPIError(f"Network error: {e}") from e
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse arXiv API response: {e}")
-        raise ArxivAPIError(f"Invalid API response: {e}") from e
+    Raises:
+        ArxivAPIError: If the API request fails
+        ValueError: If parameters are invalid
+    """
+    if not 1 <= per_query <= 100:
+        raise ValueError("per_query must be between 1 and 100")
+    
+    clean_queries = [q.strip() for q in queries if q and q.strip()]
+    if not clean_queries:
+        raise ValueError("queries cannot be empty")
+    
+    params = {
+        **_SEARCH_PARAMS,
+        "search_query": " OR ".join(f"(all:{q})" for q in clean_queries),
+        "max_results": min(len(clean_queries) * per_query, MAX_RESULTS_PER_REQUEST),
+    }
+    
+    papers = _fetch_papers(params, f"searching arXiv for {clean_queries}")
+    
+    results: Dict[str, List[Dict[str, Any]]] = {q: [] for q in clean_queries}
+    keywords = {q: _query_keywords(q) for q in clean_queries}
+    for paper in papers:
+        words = set(_WORD_RE.findall(f"{paper['title']} {paper['summary']}".lower()))
+        scores = {q: len(kws & words) for q, kws in keywords.items()}
+        best = max(scores.values())
+        if best == 0:
+            continue
+        # Each paper goes to one query only (the first best match with room),
+        # so parallel per-query analyses never analyze the same paper twice
+        for q, score in scores.items():
+            if score == best and len(results[q]) < per_query:
+                results[q].append(paper)
+                break
+    
+    return results
 
 
 def search_arxiv_by_category(
@@ -292,51 +617,54 @@ def search_arxiv_by_category(
     if not 1 <= max_results <= 100:
         raise ValueError("max_results must be between 1 and 100")
 
-    if sort_by not in ["relevance", "lastUpdatedDate", "submittedDate"]:
+    if sort_by not in SORT_BY_VALUES:
         raise ValueError("sort_by must be 'relevance', 'lastUpdatedDate', or 'submittedDate'")
 
-    if sort_order not in ["ascending", "descending"]:
+    if sort_order not in SORT_ORDER_VALUES:
         raise ValueError("sort_order must be 'ascending' or 'descending'")
     
     params = {
+        **_SEARCH_PARAMS,
         "search_query": search_query,
-        "start": 0,
         "max_results": max_results,
         "sortBy": sort_by,
         "sortOrder": sort_order,
     }
     
-    try:
-        client = _get_client()
-        response = _rate_limited_request(client, ARXIV_API_URL, params)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        
-        papers = []
-        for entry in root.findall("atom:entry", NAMESPACES):
-            paper = _parse_entry(entry)
-            papers.append(paper)
-        
-        return papers
-            
-    except httpx.TimeoutException as e:
-        logger.error(f"Timeout searching arXiv category '{category}': {e}")
-        raise ArxivAPIError(f"Request timed out: {e}") from e
-    except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error searching arXiv: {e}")
-        raise ArxivAPIError(f"HTTP error: {e.response.status_code}") from e
-    except httpx.RequestError as e:
-        logger.error(f"Network error searching arXiv: {e}")
-        raise ArxivAPIError(f"Network error: {e}") from e
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse arXiv API response: {e}")
-        raise ArxivAPIError(f"Invalid API response: {e}") from e
+    return _fetch_papers(params, f"searching arXiv category '{category}'")
+
+
+class _PaperNotFound(Exception):
+    """Raised by _get_paper_by_id_cached so that misses are never memoized."""
+
+
+@lru_cache(maxsize=1024)
+def _get_paper_by_id_cached(arxiv_id: str, time_bucket: int) -> Dict[str, Any]:
+    """Fetch a paper by ID, memoized per time bucket.
+    
+    time_bucket only makes entries expire: callers pass the current
+    PAPER_CACHE_TTL window, so a new window misses and refetches. A missing
+    paper raises _PaperNotFound instead of returning None, since lru_cache does
+    not cache exceptions and a newly announced ID should be found once indexed.
+    """
+    params = {
+        "id_list": arxiv_id,
+        "max_results": 1,
+    }
+    
+    paper = next(_iter_papers(params, f"getting paper {arxiv_id}"), None)
+    if paper is None:
+        raise _PaperNotFound(arxiv_id)
+    return paper
 
 
 def get_paper_by_id(arxiv_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific paper by its arXiv ID.
     
+    Found papers are cached in memory for up to PAPER_CACHE_TTL seconds, so
+    repeated lookups of the same paper skip the request and parse. Misses are
+    not cached.
+    
     Args:
         arxiv_id: The arXiv ID (e.g., "2301.12345" or "2301.12345v1")
         
@@ -353,33 +681,9 @@ def get_paper_by_id(arxiv_id: str) -> Optional[Dict[str, Any]]:
     # Clean the ID
     clean_id = arxiv_id.strip()
     
-    params = {
-        "id_list": clean_id,
-        "max_results": 1,
-    }
-    
     try:
-        client = _get_client()
-        response = _rate_limited_request(client, ARXIV_API_URL, params)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        
-        entries = root.findall("atom:entry", NAMESPACES)
-        if not entries:
-            return None
-        
-        return _parse_entry(entries[0])
-            
-    except httpx.TimeoutException as e:
-        logger.error(f"Timeout getting paper {arxiv_id}: {e}")
-        raise ArxivAPIError(f"Request timed out: {e}") from e
-    except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error getting paper: {e}")
-        raise ArxivAPIError(f"HTTP error: {e.response.status_code}") from e
-    except httpx.RequestError as e:
-        logger.error(f"Network error getting paper: {e}")
-        raise ArxivAPIError(f"Network error: {e}") from e
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse arXiv API response: {e}")
-        raise ArxivAPIError(f"Invalid API response: {e}") from e
+        paper = _get_paper_by_id_cached(clean_id, int(time.time() // PAPER_CACHE_TTL))
+    except _PaperNotFound:
+        return None
+    # Copy so callers can't mutate the cached entry
+    return copy.deepcopy(paper)
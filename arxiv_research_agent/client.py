@@ -4,20 +4,31 @@ This module provides a REST API to start research agents and check their status.
 """
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import os
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+from azure.identity import (
+    AzureCliCredential,
+    ChainedTokenCredential,
+    EnvironmentCredential,
+    ManagedIdentityCredential,
+)
 from durabletask import client as durable_client
 from durabletask.azuremanaged.client import DurableTaskSchedulerClient
 
+from .serialization import data_converter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,12 +41,7 @@ logger = logging.getLogger(__name__)
 class AgentStartRequest(BaseModel):
     """Request to start a new research agent."""
     topic: str
-    max_iterations: int = 3
-    
-    @property
-    def validated_max_iterations(self) -> int:
-        """Ensure max_iterations is within bounds."""
-        return max(1, min(10, self.max_iterations))
+    max_iterations: int = Field(default=3, ge=1, le=10)
 
 
 class AgentStartResponse(BaseModel):
@@ -65,24 +71,88 @@ class AgentResult(BaseModel):
 # Global client
 _client: Optional[DurableTaskSchedulerClient] = None
 
+# Credential created by get_credential; only set once creation succeeds
+_credential = None
+
+# Scheduler connection settings, read once at import
+_ENDPOINT = os.getenv("ENDPOINT", "http://localhost:8080")
+_TASKHUB = os.getenv("TASKHUB", "default")
+_SECURE = _ENDPOINT != "http://localhost:8080"
+_CLIENT_ID = os.getenv("AZURE_MANAGED_IDENTITY_CLIENT_ID")
+
+# Runtime status to API status string
+STATUS_MAP = {
+    durable_client.OrchestrationStatus.PENDING: "PENDING",
+    durable_client.OrchestrationStatus.RUNNING: "RUNNING",
+    durable_client.OrchestrationStatus.COMPLETED: "COMPLETED",
+    durable_client.OrchestrationStatus.FAILED: "FAILED",
+    durable_client.OrchestrationStatus.TERMINATED: "TERMINATED",
+    durable_client.OrchestrationStatus.SUSPENDED: "SUSPENDED",
+}
+
+# Orchestration statuses that will not change again
+_TERMINAL_STATUSES = frozenset({
+    durable_client.OrchestrationStatus.COMPLETED,
+    durable_client.OrchestrationStatus.FAILED,
+    durable_client.OrchestrationStatus.TERMINATED,
+})
+
+# Statuses of finished agents never change, so they are parsed once and served
+# from this LRU on later polls
+TERMINAL_STATUS_CACHE_SIZE = 1024
+_terminal_status_cache: "OrderedDict[Tuple[str, bool], Tuple[str, AgentStatus]]" = OrderedDict()
+
+# /wait first blocks briefly on the scheduler, then polls with backoff so it
+# does not hold a worker thread for the whole timeout
+WAIT_LONG_POLL_SECONDS = 5.0
+WAIT_POLL_INITIAL_DELAY = 2.0
+WAIT_POLL_BACKOFF = 1.5
+WAIT_POLL_MAX_DELAY = 30.0
+
+# The DurableTask client is blocking gRPC, so every scheduler call holds a
+# thread. They run on a dedicated pool, created in lifespan, sized well above
+# asyncio's default and kept apart from other to_thread users.
+SCHEDULER_THREAD_POOL_SIZE = int(os.getenv("SCHEDULER_THREAD_POOL_SIZE", "256"))
+_scheduler_executor: Optional[ThreadPoolExecutor] = None
+
+# Fire-and-forget scheduler calls; the loop only keeps weak references to tasks
+_background_tasks: set = set()
+
+# In-flight /wait calls by instance ID, so concurrent waiters on the same
+# orchestration share one upstream wait
+_pending_waits: Dict[str, "asyncio.Future[Optional[durable_client.OrchestrationState]]"] = {}
+
 
 def get_credential():
-    """Get Azure credential for authentication."""
-    endpoint = os.getenv("ENDPOINT", "http://localhost:8080")
+    """Get Azure credential for authentication.
     
-    if endpoint == "http://localhost:8080":
+    The credential is created once and reused; a failed attempt is not
+    remembered, so the next call tries again.
+    """
+    global _credential
+    
+    if not _SECURE:
         return None
     
+    if _credential is not None:
+        return _credential
+    
     try:
-        client_id = os.getenv("AZURE_MANAGED_IDENTITY_CLIENT_ID")
-        if client_id:
-            logger.info(f"Using Managed Identity with client ID: {client_id}")
-            credential = ManagedIdentityCredential(client_id=client_id)
-            credential.get_token("https://management.azure.com/.default")
-            return credential
+        if _CLIENT_ID:
+            logger.info(f"Using Managed Identity with client ID: {_CLIENT_ID}")
+            # No eager get_token: the scheduler's auth interceptor fetches a token
+            # for its own scope on the first call and caches it
+            _credential = ManagedIdentityCredential(client_id=_CLIENT_ID)
         else:
-            logger.info("Using DefaultAzureCredential")
-            return DefaultAzureCredential()
+            # Only the providers a deployed worker or API actually uses, instead
+            # of DefaultAzureCredential probing every developer tool in turn
+            logger.info("Using managed identity, environment or Azure CLI credentials")
+            _credential = ChainedTokenCredential(
+                ManagedIdentityCredential(),
+                EnvironmentCredential(),
+                AzureCliCredential(),
+            )
+        return _credential
     except Exception as e:
         logger.error(f"Authentication error: {e}")
         return None
@@ -93,28 +163,153 @@ def get_client() -> DurableTaskSchedulerClient:
     global _client
     
     if _client is None:
-        taskhub_name = os.getenv("TASKHUB", "default")
-        endpoint = os.getenv("ENDPOINT", "http://localhost:8080")
         credential = get_credential()
         
-        logger.info(f"Creating client with endpoint={endpoint}, taskhub={taskhub_name}")
+        logger.info(f"Creating client with endpoint={_ENDPOINT}, taskhub={_TASKHUB}")
         
         _client = DurableTaskSchedulerClient(
-            host_address=endpoint,
-            secure_channel=endpoint != "http://localhost:8080",
-            taskhub=taskhub_name,
-            token_credential=credential
+            host_address=_ENDPOINT,
+            secure_channel=_SECURE,
+            taskhub=_TASKHUB,
+            token_credential=credential,
+            data_converter=data_converter
         )
     
     return _client
 
 
+async def _wait_for_completion(
+    client: DurableTaskSchedulerClient, instance_id: str, timeout: float
+) -> Optional[durable_client.OrchestrationState]:
+    """Wait for an orchestration to reach a terminal status.
+    
+    Starts with a short blocking wait so fast orchestrations return immediately,
+    then polls with exponential backoff, sleeping on the event loop between polls.
+    
+    Args:
+        client: DurableTask client
+        instance_id: The orchestration instance ID
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        The terminal orchestration state, or None if the instance does not
+        exist or did not finish within the timeout
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    
+    try:
+        state = await _run_blocking(
+            client.wait_for_orchestration_completion,
+            instance_id,
+            timeout=min(WAIT_LONG_POLL_SECONDS, timeout)
+        )
+    except TimeoutError:
+        state = await _run_blocking(client.get_orchestration_state, instance_id)
+    
+    delay = WAIT_POLL_INITIAL_DELAY
+    while state is not None and state.runtime_status not in _TERMINAL_STATUSES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * WAIT_POLL_BACKOFF, WAIT_POLL_MAX_DELAY)
+        state = await _run_blocking(client.get_orchestration_state, instance_id)
+    
+    return state
+
+
+async def _shared_wait_for_completion(
+    client: DurableTaskSchedulerClient, instance_id: str, timeout: float
+) -> Optional[durable_client.OrchestrationState]:
+    """Wait for an orchestration, joining any wait already in flight for it.
+    
+    The first caller starts the upstream wait; later callers await the same
+    task, bounded by their own timeout. If a joined wait gives up before the
+    joiner's own deadline, the joiner waits again for its remaining time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    
+    while True:
+        remaining = max(deadline - loop.time(), 0.0)
+        pending = _pending_waits.get(instance_id)
+        owner = pending is None
+        if owner:
+            pending = asyncio.ensure_future(_wait_for_completion(client, instance_id, remaining))
+            _pending_waits[instance_id] = pending
+            pending.add_done_callback(lambda _: _pending_waits.pop(instance_id, None))
+        
+        try:
+            # shield: one waiter disconnecting must not cancel the shared wait
+            state = await asyncio.wait_for(asyncio.shield(pending), remaining)
+        except asyncio.TimeoutError:
+            return None
+        
+        # None from our own wait is final; from a joined wait it may only mean
+        # that the other caller's shorter timeout ran out
+        if state is not None or owner or loop.time() >= deadline:
+            return state
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking DurableTask client call on the scheduler thread pool.
+    
+    Falls back to the loop's default executor when the pool has not been
+    created (e.g. the app is used without its lifespan).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _scheduler_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+def _run_in_background(func, *args, **kwargs) -> asyncio.Task:
+    """Run a blocking client call in the thread pool without awaiting it.
+    
+    Failures are logged when the call finishes, since the caller has already
+    returned its response.
+    """
+    task = asyncio.create_task(_run_blocking(func, *args, **kwargs))
+    _background_tasks.add(task)
+    task.add_done_callback(_log_background_errors)
+    return task
+
+
+def _log_background_errors(task: asyncio.Task) -> None:
+    """Done callback that drops the task reference and logs any failure."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background scheduler call failed: {task.exception()}")
+
+
+def _status_etag(state: durable_client.OrchestrationState, include_report: bool) -> str:
+    """Version tag for an orchestration's status, derived without parsing its payloads."""
+    version = f"{state.runtime_status}:{state.last_updated_at}:{include_report}".encode()
+    return f'"{hashlib.blake2b(version, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
+    global _scheduler_executor
+    
     logger.info("Starting arXiv Research Agent API...")
+    _scheduler_executor = ThreadPoolExecutor(
+        max_workers=SCHEDULER_THREAD_POOL_SIZE, thread_name_prefix="dts"
+    )
     yield
     logger.info("Shutting down arXiv Research Agent API...")
+    executor, _scheduler_executor = _scheduler_executor, None
+    executor.shutdown(wait=False, cancel_futures=True)
 
 
 # Create FastAPI app
@@ -152,12 +347,12 @@ async def start_agent(request: AgentStartRequest):
         client = get_client()
         
         # Schedule the orchestration
-        instance_id = await asyncio.to_thread(
+        instance_id = await _run_blocking(
             client.schedule_new_orchestration,
             "arxiv_research_orchestrator",
             input={
                 "topic": request.topic.strip(),
-                "max_iterations": request.validated_max_iterations
+                "max_iterations": request.max_iterations
             }
         )
         
@@ -188,52 +383,73 @@ async def list_agents():
 
 
 @app.get("/agents/{instance_id}", response_model=AgentStatus)
-async def get_agent_status(instance_id: str):
-    """Get the status of a specific research agent."""
+async def get_agent_status(
+    instance_id: str,
+    response: Response,
+    include_report: bool = False,
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """Get the status of a specific research agent.
+    
+    The orchestration output (report and iteration count) is only parsed when
+    include_report is set, so status polls stay cheap while the agent runs;
+    without it, report and iterations are None.
+    The response carries an ETag; pollers that send it back in If-None-Match
+    get an empty 304 until the orchestration's status changes.
+    """
+    cache_key = (instance_id, include_report)
+    cached = _terminal_status_cache.get(cache_key)
+    if cached is not None:
+        _terminal_status_cache.move_to_end(cache_key)
+        etag, agent_status = cached
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return agent_status
+    
     try:
         client = get_client()
         
         # Get orchestration state
-        state = await asyncio.to_thread(client.get_orchestration_state, instance_id)
+        state = await _run_blocking(client.get_orchestration_state, instance_id)
         
         if state is None:
             raise HTTPException(status_code=404, detail="Agent not found")
         
-        # Map runtime status to string
-        status_map = {
-            durable_client.OrchestrationStatus.PENDING: "PENDING",
-            durable_client.OrchestrationStatus.RUNNING: "RUNNING",
-            durable_client.OrchestrationStatus.COMPLETED: "COMPLETED",
-            durable_client.OrchestrationStatus.FAILED: "FAILED",
-            durable_client.OrchestrationStatus.TERMINATED: "TERMINATED",
-            durable_client.OrchestrationStatus.SUSPENDED: "SUSPENDED",
-        }
+        etag = _status_etag(state, include_report)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
         
-        status = status_map.get(state.runtime_status, "UNKNOWN")
+        status = STATUS_MAP.get(state.runtime_status, "UNKNOWN")
         
-        # Parse output if completed
+        # Parse output if completed and the caller asked for the report;
+        # otherwise report and iterations stay unknown (None)
         report = None
         topic = ""
-        iterations = 0
+        iterations = None
         
-        if state.runtime_status == durable_client.OrchestrationStatus.COMPLETED and state.serialized_output:
+        if (
+            include_report
+            and state.runtime_status == durable_client.OrchestrationStatus.COMPLETED
+            and state.serialized_output
+        ):
             try:
-                output = json.loads(state.serialized_output)
+                output = orjson.loads(state.serialized_output)
                 report = output.get("report")
                 topic = output.get("topic", "")
                 iterations = output.get("iterations", 0)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
         
         # Parse input for topic
         if state.serialized_input and not topic:
             try:
-                input_data = json.loads(state.serialized_input)
+                input_data = orjson.loads(state.serialized_input)
                 topic = input_data.get("topic", "")
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
         
-        return AgentStatus(
+        agent_status = AgentStatus(
             agent_id=instance_id,
             topic=topic,
             status=status,
@@ -241,6 +457,14 @@ async def get_agent_status(instance_id: str):
             iterations=iterations,
             report=report
         )
+        
+        if state.runtime_status in _TERMINAL_STATUSES:
+            _terminal_status_cache[cache_key] = (etag, agent_status)
+            if len(_terminal_status_cache) > TERMINAL_STATUS_CACHE_SIZE:
+                _terminal_status_cache.popitem(last=False)
+        
+        response.headers["ETag"] = etag
+        return agent_status
     
     except HTTPException:
         raise
@@ -261,11 +485,7 @@ async def wait_for_agent(instance_id: str, timeout: int = 300):
         client = get_client()
         
         # Wait for completion
-        state = await asyncio.to_thread(
-            client.wait_for_orchestration_completion,
-            instance_id,
-            timeout=timeout
-        )
+        state = await _shared_wait_for_completion(client, instance_id, timeout)
         
         if state is None:
             raise HTTPException(status_code=408, detail="Timeout waiting for agent completion")
@@ -279,7 +499,7 @@ async def wait_for_agent(instance_id: str, timeout: int = 300):
         # Parse output
         if not state.serialized_output:
             raise HTTPException(status_code=500, detail="No output from orchestration")
-        output = json.loads(state.serialized_output)
+        output = orjson.loads(state.serialized_output)
         
         return AgentResult(
             topic=output.get("topic", ""),
@@ -301,8 +521,9 @@ async def terminate_agent(instance_id: str):
     try:
         client = get_client()
         
-        # Terminate the orchestration
-        await asyncio.to_thread(
+        # Termination is processed asynchronously by the scheduler anyway, so
+        # enqueue the request and return without waiting for the RPC
+        _run_in_background(
             client.terminate_orchestration,
             instance_id,
             output="Terminated by user"
@@ -1,12 +1,20 @@
 """LLM utilities for the arXiv Research Agent."""
 
 import os
-import json
-from typing import Dict, List
+import hashlib
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
 
-from openai import OpenAI
+import httpx
+import orjson
+from openai import DefaultHttpxClient, OpenAI
 from dotenv import load_dotenv
 
+from .llm_cache import LLMCache
+
 # Load environment variables
 load_dotenv()
 
@@ -20,23 +28,36 @@ client = None
 if AZURE_OPENAI_ENDPOINT:
     try:
         base_url = f"{AZURE_OPENAI_ENDPOINT.rstrip('/')}/openai/v1/"
+        # One pooled HTTP/2 connection serves all LLM calls, including concurrent
+        # activities on the worker's threads; keeps the SDK's default timeouts
+        http_client = DefaultHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
         
         if AZURE_OPENAI_API_KEY:
             # Use API key authentication
             client = OpenAI(
                 base_url=base_url,
                 api_key=AZURE_OPENAI_API_KEY,
+                http_client=http_client,
             )
         else:
             # Use Entra ID (Azure AD) authentication
             from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+            # Skip the developer-tool discovery rungs that never apply on a server
+            credential = DefaultAzureCredential(
+                exclude_interactive_browser_credential=True,
+                exclude_visual_studio_code_credential=True,
+            )
             token_provider = get_bearer_token_provider(
-                DefaultAzureCredential(),
+                credential,
                 "https://cognitiveservices.azure.com/.default"
             )
             client = OpenAI(
                 base_url=base_url,
                 api_key=token_provider,
+                http_client=http_client,
             )
     except Exception as e:
         import warnings
@@ -50,6 +71,157 @@ DEFAULT_MODEL = AZURE_OPENAI_DEPLOYMENT
 DEFAULT_TEMPERATURE = 0.1
 DEFAULT_MAX_TOKENS = 2000
 
+# Exact-match response cache: identical low-temperature prompts (activity
+# retries, replays after a worker restart, re-runs of the same topic) reuse
+# the earlier response
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = 3600.0
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.2
+_response_cache = LLMCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+# Optional proactive pacing of LLM calls to the deployment's quota; 0 or unset
+# disables a limit. Calls wait for capacity instead of hitting 429s and retrying.
+LLM_REQUESTS_PER_MINUTE = int(os.environ.get("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = int(os.environ.get("LLM_TOKENS_PER_MINUTE", "0"))
+# Rough prompt token estimate, as in the OpenAI cookbook's parallel processor
+_CHARS_PER_TOKEN = 4
+
+
+class RateLimiter:
+    """Token-bucket limiter for per-minute request and token budgets.
+    
+    Both budgets start full and refill continuously. acquire() blocks the
+    calling thread until one request and the estimated tokens are available.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """Create a limiter.
+
+        Args:
+            requests_per_minute: Request budget, or 0 for no request limit
+            tokens_per_minute: Token budget, or 0 for no token limit
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_capacity = float(requests_per_minute)
+        self._token_capacity = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        """Wait until a request of the given estimated size may be sent."""
+        rpm, tpm = self.requests_per_minute, self.tokens_per_minute
+        # A request larger than the whole budget waits for a full bucket
+        tokens = min(tokens, tpm)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._last_refill = now
+                self._request_capacity = min(rpm, self._request_capacity + elapsed * rpm / 60)
+                self._token_capacity = min(tpm, self._token_capacity + elapsed * tpm / 60)
+
+                wait = 0.0
+                if rpm and self._request_capacity < 1:
+                    wait = (1 - self._request_capacity) * 60 / rpm
+                if tpm and self._token_capacity < tokens:
+                    wait = max(wait, (tokens - self._token_capacity) * 60 / tpm)
+                if wait == 0:
+                    self._request_capacity -= 1 if rpm else 0
+                    self._token_capacity -= tokens if tpm else 0
+                    return
+            time.sleep(wait)
+
+
+rate_limiter = (
+    RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+    if LLM_REQUESTS_PER_MINUTE or LLM_TOKENS_PER_MINUTE
+    else None
+)
+
+# Cap on in-flight LLM requests per worker process. Orchestrations fan out
+# analysis activities in parallel; past this many, calls queue here instead
+# of bursting into 429s that LLM_RETRY_POLICY has to back off from.
+MAX_CONCURRENT_LLM = int(os.environ.get("MAX_CONCURRENT_LLM", "5"))
+_llm_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_LLM)
+
+# Optional semantic response cache (requires numpy and sentence-transformers)
+LLM_SEMANTIC_CACHE_PATH = os.environ.get("LLM_SEMANTIC_CACHE_PATH")
+LLM_SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("LLM_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+semantic_cache = None
+if LLM_SEMANTIC_CACHE_PATH:
+    try:
+        from .llm_cache import SemanticCache
+        semantic_cache = SemanticCache(
+            LLM_SEMANTIC_CACHE_PATH,
+            threshold=LLM_SEMANTIC_CACHE_THRESHOLD,
+        )
+    except Exception as e:
+        import warnings
+        warnings.warn(f"Failed to initialize semantic cache: {e}")
+
+
+def _response_cache_key(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    json_output: bool,
+) -> str:
+    """Hash every input that affects the response."""
+    payload = orjson.dumps(
+        [model, temperature, max_tokens, json_output, messages], option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+# Prefixes used when flattening messages into a single Responses API input
+_ROLE_PREFIX = {"system": "SYSTEM: ", "user": "USER: ", "assistant": "ASSISTANT: "}
+
+
+def _cache_namespace(messages: List[Dict[str, str]], model: str, json_output: bool) -> str:
+    """Build the semantic cache partition for a call.
+    
+    Everything except the final user message (system prompt, earlier turns) plus
+    the model and output mode must match exactly for a cached response to be reused.
+    """
+    context = "\n".join(f"{msg['role']}:{msg['content']}" for msg in messages[:-1])
+    return hashlib.sha256(f"{model}|{json_output}|{context}".encode()).hexdigest()
+
+
+def _prompt_cache_key(messages: List[Dict[str, str]]) -> Optional[str]:
+    """Routing key for the provider's prompt prefix cache.
+    
+    Calls that share a leading system prompt get the same key, so they are sent
+    to the same cache and the shared prefix is not prefilled again.
+    """
+    if not messages or messages[0]["role"] != "system":
+        return None
+    return _system_prompt_key(messages[0]["content"])
+
+
+@lru_cache(maxsize=32)
+def _system_prompt_key(system_prompt: str) -> str:
+    """Hash a system prompt; activities reuse a handful of constant prompts."""
+    return hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+
+
+def _response_text(response) -> Optional[str]:
+    """Extract the text of a Responses API result.
+    
+    JSON replies come back as a single message with a single text part, so
+    that part is returned directly instead of concatenating every part via
+    ``output_text``. Anything else falls back to ``output_text``.
+    """
+    for item in response.output:
+        if item.type != "message":
+            continue
+        if len(item.content) == 1 and item.content[0].type == "output_text":
+            return item.content[0].text
+        break
+    return response.output_text
+
 
 def call_llm(
     messages: List[Dict[str, str]],
@@ -57,6 +229,7 @@ def call_llm(
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
     json_output: bool = True,
+    use_semantic_cache: bool = True,
 ) -> str:
     """Core LLM API call using Responses API.
     
@@ -66,6 +239,8 @@ def call_llm(
         temperature: Sampling temperature
         max_tokens: Maximum tokens in response
         json_output: If True, force structured JSON output
+        use_semantic_cache: If True and the semantic cache is enabled, reuse the
+            response of a sufficiently similar earlier prompt
         
     Returns:
         The LLM response content as a string
@@ -77,13 +252,30 @@ def call_llm(
     if client is None:
         raise RuntimeError("OpenAI client not initialized. Set AZURE_OPENAI_ENDPOINT (and optionally AZURE_OPENAI_API_KEY or use Entra ID).")
     
+    exact_key = None
+    if temperature <= RESPONSE_CACHE_MAX_TEMPERATURE:
+        exact_key = _response_cache_key(messages, model, temperature, max_tokens, json_output)
+        cached = _response_cache.get(exact_key)
+        if cached is not None:
+            return cached
+    
+    cache = semantic_cache if use_semantic_cache and messages else None
+    if cache is not None:
+        namespace = _cache_namespace(messages, model, json_output)
+        cached = cache.lookup(namespace, messages[-1]["content"])
+        if cached is not None:
+            return cached
+    
     try:
         # Convert messages to input format for Responses API
         # Combine system and user messages into a single input
-        input_text = "\n".join(
-            f"{msg['role'].upper()}: {msg['content']}" 
-            for msg in messages
-        )
+        parts = []
+        for msg in messages:
+            role = msg["role"]
+            parts.append(_ROLE_PREFIX.get(role) or f"{role.upper()}: ")
+            parts.append(msg["content"])
+            parts.append("\n")
+        input_text = "".join(parts[:-1])
         
         # Build API call parameters
         params = {
@@ -97,24 +289,52 @@ def call_llm(
         if json_output:
             params["text"] = {"format": {"type": "json_object"}}
         
-        response = client.responses.create(**params)
+        prompt_cache_key = _prompt_cache_key(messages)
+        if prompt_cache_key is not None:
+            params["prompt_cache_key"] = prompt_cache_key
+        
+        with _llm_semaphore:
+            if rate_limiter is not None:
+                rate_limiter.acquire(len(input_text) // _CHARS_PER_TOKEN + max_tokens)
+            response = client.responses.create(**params)
         
-        # Extract text from response output
-        content = response.output_text
+        content = _response_text(response)
         if content is None:
             raise ValueError("LLM returned empty response")
-        return content
     except Exception as e:
         raise Exception(f"LLM API call failed: {str(e)}") from e
+    
+    if exact_key is not None:
+        _response_cache.set(exact_key, content)
+    if cache is not None:
+        cache.store(namespace, messages[-1]["content"], content)
+    return content
 
 
-def parse_json_response(response: str) -> Dict:
+# JSON wrapped in a Markdown code fence, as models without a JSON response
+# format tend to emit it
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\}|\[.*\])\s*```", re.DOTALL)
+
+
+def parse_json_response(response: Union[str, Dict, List]) -> Dict:
     """Parse JSON from LLM response.
     
     Args:
-        response: Raw LLM response string
+        response: Raw LLM response string; an already-parsed dict or list is
+                  returned unchanged
         
     Returns:
         Parsed JSON as dictionary
     """
-    return json.loads(response.strip())
+    if isinstance(response, (dict, list)):
+        return response
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    # keep catching the stdlib exception. JSON mode makes bare JSON the common
+    # case, so the fence search only runs when that parse fails.
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        match = _JSON_FENCE_RE.search(response)
+        if match is None:
+            raise
+        return orjson.loads(match.group(1))
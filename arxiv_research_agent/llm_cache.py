@@ -0,0 +1,184 @@
+"""Response caches for LLM calls made by the arXiv Research Agent."""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only SemanticCache needs it (semantic-cache extra)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Default embedding model and similarity threshold for semantic lookups
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+# Default size and lifetime of exact-match cache entries
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 3600.0
+
+
+class LLMCache:
+    """In-memory LRU cache of LLM responses keyed on an exact prompt hash.
+    
+    Entries expire after ttl seconds, and the least recently used entry is
+    evicted once maxsize is exceeded. Hit and miss counts are kept for logging.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (expiry time, response)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            hits, misses = self.hits, self.misses
+        logger.info(f"LLM response cache hit ({hits} hits, {misses} misses)")
+        return entry[1]
+
+    def set(self, key: str, response: str) -> None:
+        """Cache a response, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """LLM response cache keyed on prompt embedding similarity.
+
+    Prompts are embedded with a small local sentence-transformers model and
+    normalized at insert time, so a single matrix-vector product gives the
+    cosine similarity against every cached prompt. Entries are partitioned by
+    namespace (e.g. model + system prompt) so prompts from different activities
+    never match each other. Entries are persisted to SQLite and reloaded on start.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        encoder: Optional[Callable[[str], "np.ndarray"]] = None,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database path
+            threshold: Minimum cosine similarity for a cache hit
+            model_name: sentence-transformers model used to embed prompts
+            encoder: Optional function mapping text to an embedding vector;
+                     defaults to the sentence-transformers model
+        """
+        self.threshold = threshold
+        self._model_name = model_name
+        self._encoder = encoder
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, embedding BLOB NOT NULL, response TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        # namespace -> (embedding matrix, responses)
+        self._entries: Dict[str, Tuple["np.ndarray", List[str]]] = {}
+        for namespace, blob, response in self._conn.execute(
+            "SELECT namespace, embedding, response FROM entries ORDER BY rowid"
+        ):
+            self._append(namespace, np.frombuffer(blob, dtype=np.float32), response)
+
+    def _encode(self, text: str) -> "np.ndarray":
+        """Embed text as a unit-length float32 vector."""
+        if self._encoder is None:
+            with self._lock:
+                if self._encoder is None:
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(self._model_name)
+                    self._encoder = model.encode
+        embedding = np.asarray(self._encoder(text), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _append(self, namespace: str, embedding: "np.ndarray", response: str) -> None:
+        """Add an embedding/response pair to the in-memory index."""
+        matrix, responses = self._entries.get(namespace, (None, []))
+        row = embedding.reshape(1, -1)
+        matrix = row if matrix is None else np.vstack([matrix, row])
+        self._entries[namespace] = (matrix, responses + [response])
+
+    def lookup(self, namespace: str, text: str) -> Optional[str]:
+        """Return the cached response for the most similar prompt, if any.
+
+        Args:
+            namespace: Partition to search
+            text: Prompt text to match
+
+        Returns:
+            Cached response if similarity exceeds the threshold, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(namespace)
+        if entry is None:
+            return None
+
+        matrix, responses = entry
+        similarities = matrix @ self._encode(text)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+        return responses[best]
+
+    def store(self, namespace: str, text: str, response: str) -> None:
+        """Cache a response for a prompt.
+
+        Args:
+            namespace: Partition to store the entry in
+            text: Prompt text
+            response: LLM response to cache
+        """
+        embedding = self._encode(text)
+        with self._lock:
+            self._append(namespace, embedding, response)
+            self._conn.execute(
+                "INSERT INTO entries (namespace, embedding, response) VALUES (?, ?, ?)",
+                (namespace, embedding.tobytes(), response),
+            )
+            self._conn.commit()
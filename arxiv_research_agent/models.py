@@ -1,9 +1,11 @@
 """Data models for the arXiv Research Agent."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Any, Dict
 from enum import Enum
 
+import orjson
+
 
 class AgentStatusEnum(str, Enum):
     """Agent status enumeration."""
@@ -13,7 +15,7 @@ class AgentStatusEnum(str, Enum):
     FAILED = "FAILED"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PaperReference:
     """Reference to an arXiv paper."""
     arxiv_id: str
@@ -29,8 +31,16 @@ class PaperReference:
     journal_ref: str = ""
     doi: str = ""
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {name: getattr(self, name) for name in _PAPER_FIELDS}
+
 
-@dataclass
+# PaperReference field names in declaration order, computed once for to_dict
+_PAPER_FIELDS = tuple(f.name for f in fields(PaperReference))
+
+
+@dataclass(slots=True, frozen=True)
 class EvaluationResult:
     """Result from evaluating search results."""
     query: str
@@ -50,27 +60,19 @@ class EvaluationResult:
             "summary": self.summary,
             "key_points": self.key_points,
             "research_gaps": self.research_gaps,
-            "top_papers": [
-                {
-                    "arxiv_id": p.arxiv_id,
-                    "title": p.title,
-                    "authors": p.authors,
-                    "summary": p.summary,
-                    "published": p.published,
-                    "primary_category": p.primary_category,
-                    "categories": p.categories,
-                    "pdf_url": p.pdf_url,
-                    "abs_url": p.abs_url,
-                    "comment": p.comment,
-                    "journal_ref": p.journal_ref,
-                    "doi": p.doi,
-                }
-                for p in self.top_papers
-            ]
+            "top_papers": [p.to_dict() for p in self.top_papers]
         }
 
 
-@dataclass
+def serialize_evaluation(result: EvaluationResult) -> bytes:
+    """Serialize an EvaluationResult, including its papers, to JSON bytes.
+    
+    orjson walks the dataclasses natively, so no intermediate dict is built.
+    """
+    return orjson.dumps(result, option=orjson.OPT_SERIALIZE_DATACLASS)
+
+
+@dataclass(slots=True, frozen=True)
 class ResearchReport:
     """Final research report."""
     report: str
@@ -87,21 +89,21 @@ class AgentStatus:
     agent_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentStartRequest:
     """Request to start a new research agent."""
     topic: str
     max_iterations: int = 3
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchTopicInput:
     """Input for researching a specific topic."""
     main_topic: str
     query: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchWorkflowInput:
     """Input for the main research workflow."""
     topic: str
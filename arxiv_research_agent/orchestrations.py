@@ -5,14 +5,24 @@ They are durable and can survive process restarts, automatically resuming
 from their last checkpoint.
 """
 
+import base64
 import logging
+import zlib
 from datetime import timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
+import orjson
 from durabletask import task
 
+from .activities import MAX_PAPERS_TO_ANALYZE
+
 logger = logging.getLogger(__name__)
 
+# Retry policies are shared module constants. task.RetryPolicy has no jitter
+# option, and orchestrator code must stay deterministic, so retry spreading is
+# done inside the activities instead (jittered backoff in arxiv_api; the OpenAI
+# SDK's own retries, throttled by llm's concurrency cap).
+
 # Retry policy for arXiv API calls (network-related)
 ARXIV_RETRY_POLICY = task.RetryPolicy(
     first_retry_interval=timedelta(seconds=5),
@@ -31,17 +41,44 @@ LLM_RETRY_POLICY = task.RetryPolicy(
     retry_timeout=timedelta(minutes=5)
 )
 
+# Maximum follow-up queries researched in parallel per iteration; keeps each
+# iteration's history and the continue_as_new state bounded
+PARALLEL_FANOUT = 3
+
+# Papers per analysis call; larger result sets are analyzed in concurrent
+# chunks and merged, so each LLM call gets a short prompt
+ANALYZE_CHUNK_SIZE = 5
+
+# Analysis fields kept in all_findings across iterations
+_FINDING_FIELDS = ("query", "insights", "relevance_score", "summary", "key_points", "research_gaps")
+
+
+def _no_papers_result(query: str, summary: str) -> Dict[str, Any]:
+    """Analysis result for a query with nothing to analyze."""
+    return {
+        "query": query,
+        "insights": [],
+        "relevance_score": 0,
+        "summary": summary,
+        "key_points": [],
+        "research_gaps": [],
+        "top_papers": []
+    }
+
 
 def paper_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str, Any]):
     """Sub-orchestration: Research papers for a specific query.
     
     This orchestrator:
-    1. Searches arXiv for papers about the query
-    2. Analyzes papers and extracts academic insights
+    1. Searches arXiv for papers about the query (unless papers were prefetched)
+       and drops the ones in seen_ids
+    2. Analyzes papers and extracts academic insights, in concurrent chunks of
+       ANALYZE_CHUNK_SIZE papers whose results are then merged
     
     Args:
         ctx: Orchestration context
-        input: Dictionary with main_topic and query
+        input: Dictionary with main_topic, query, optionally papers already
+               fetched for the query, and seen_ids of papers analyzed earlier
         
     Yields:
         Activity calls for searching and analyzing
@@ -55,42 +92,103 @@ def paper_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
     logger.info(f"Starting paper research for query: {query}")
     
     # Step 1: Search arXiv for papers
-    papers = yield ctx.call_activity(
-        "search_arxiv_activity",
-        input=query,
-        retry_policy=ARXIV_RETRY_POLICY
-    )
+    papers = input.get("papers")
+    if papers is None:
+        papers = yield ctx.call_activity(
+            "search_arxiv_activity",
+            input=query,
+            retry_policy=ARXIV_RETRY_POLICY
+        )
     
     if not papers:
         logger.info(f"No papers found for query: {query}")
-        return {
-            "query": query,
-            "insights": [],
-            "relevance_score": 0,
-            "summary": "No papers found for this query",
-            "key_points": [],
-            "research_gaps": [],
-            "top_papers": []
-        }
+        return _no_papers_result(query, "No papers found for this query")
+    
+    # Drop papers analyzed in earlier iterations before they reach the LLM,
+    # then keep at most MAX_PAPERS_TO_ANALYZE new ones
+    seen_ids = set(input.get("seen_ids", []))
+    papers = [paper for paper in papers if paper.get("arxiv_id") not in seen_ids]
+    papers = papers[:MAX_PAPERS_TO_ANALYZE]
+    if not papers:
+        logger.info(f"No new papers found for query: {query}")
+        return _no_papers_result(query, "No new papers found for this query")
     
-    logger.info(f"Found {len(papers)} papers, analyzing...")
+    logger.info(f"Found {len(papers)} new papers, analyzing...")
     
     # Step 2: Analyze papers and extract insights
+    if len(papers) <= ANALYZE_CHUNK_SIZE:
+        analysis = yield ctx.call_activity(
+            "analyze_papers_activity",
+            input={
+                "topic": main_topic,
+                "query": query,
+                "papers": papers,
+            },
+            retry_policy=LLM_RETRY_POLICY
+        )
+        return analysis
+    
+    # Map: analyze chunks of papers concurrently
+    partials = yield task.when_all([
+        ctx.call_activity(
+            "analyze_papers_activity",
+            input={
+                "topic": main_topic,
+                "query": query,
+                "papers": papers[start:start + ANALYZE_CHUNK_SIZE],
+            },
+            retry_policy=LLM_RETRY_POLICY
+        )
+        for start in range(0, len(papers), ANALYZE_CHUNK_SIZE)
+    ])
+    
+    # Reduce: merge the partial analyses
     analysis = yield ctx.call_activity(
-        "analyze_papers_activity",
-        input={
-            "topic": main_topic,
-            "query": query,
-            "papers": papers,
-        },
-        retry_policy=LLM_RETRY_POLICY
+        "merge_analyses_activity",
+        input={"query": query, "analyses": partials}
     )
     
     return analysis
 
 
+def _compact_findings(analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Project analyses down to the fields later activities read.
+
+    Findings are carried through every continue_as_new and sent to the decide,
+    gap and synthesis activities, none of which read paper metadata (that lives
+    in the citation registry). Papers are reduced to their arxiv_id.
+    """
+    compact = []
+    for analysis in analyses:
+        finding = {key: analysis[key] for key in _FINDING_FIELDS if key in analysis}
+        if "top_papers" in analysis:
+            finding["top_papers"] = [
+                {"arxiv_id": paper.get("arxiv_id", "")} for paper in analysis["top_papers"]
+            ]
+        compact.append(finding)
+    return compact
+
+
+def _pack_findings(findings: List[Dict[str, Any]]) -> str:
+    """Compress findings for the continue_as_new state.
+
+    The findings are mostly repetitive research prose that grows every
+    iteration, and the state is written to the task hub on every checkpoint,
+    so it is stored as base64 zlib-compressed JSON.
+    """
+    return base64.b64encode(zlib.compress(orjson.dumps(findings))).decode()
+
+
+def _unpack_findings(findings: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Inverse of _pack_findings; plain lists (e.g. from older instances) pass through."""
+    if isinstance(findings, str):
+        return orjson.loads(zlib.decompress(base64.b64decode(findings)))
+    return findings
+
+
 def _synthesize_and_return(ctx: task.OrchestrationContext, topic: str,
                            all_findings: List[Dict[str, Any]],
+                           all_citations: Dict[str, Dict[str, Any]],
                            current_iteration: int, reason: str) -> Dict[str, Any]:
     """Helper generator to synthesize findings and return final result.
 
@@ -98,6 +196,7 @@ def _synthesize_and_return(ctx: task.OrchestrationContext, topic: str,
         ctx: Orchestration context
         topic: Research topic
         all_findings: All collected findings
+        all_citations: Numbered citation entries keyed by arxiv_id
         current_iteration: Current iteration number
         reason: Log message explaining why synthesis is happening
 
@@ -110,7 +209,7 @@ def _synthesize_and_return(ctx: task.OrchestrationContext, topic: str,
     logger.info(reason)
     final_report = yield ctx.call_activity(
         "synthesize_research_activity",
-        input={"topic": topic, "all_findings": all_findings},
+        input={"topic": topic, "all_findings": all_findings, "citations": all_citations},
         retry_policy=LLM_RETRY_POLICY
     )
     return {
@@ -127,8 +226,10 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
     This orchestrator performs automated academic research using the continue_as_new
     pattern to prevent unbounded history growth:
     1. Executes one research iteration per orchestration instance
-    2. Calls continue_as_new with updated state to proceed to next iteration
-    3. Returns final result when max iterations reached or early termination
+    2. Researches each query in a parallel sub-orchestration; papers for
+       follow-up queries are prefetched with one combined arXiv request
+    3. Calls continue_as_new with updated state to proceed to next iteration
+    4. Returns final result when max iterations reached or early termination
 
     The continue_as_new pattern resets orchestration history after each iteration,
     making it suitable for long-running research workflows.
@@ -136,7 +237,8 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
     Args:
         ctx: Orchestration context
         input: Dictionary with topic, max_iterations, and optional state from
-               previous iterations (current_iteration, all_findings, current_query)
+               previous iterations (current_iteration, all_findings, current_queries,
+               all_citations)
 
     Yields:
         Sub-orchestration and activity calls
@@ -148,8 +250,15 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
     topic = input["topic"]
     max_iterations = input.get("max_iterations", 3)
     current_iteration = input.get("current_iteration", 0)
-    all_findings: List[Dict[str, Any]] = input.get("all_findings", [])
-    current_query = input.get("current_query", topic)
+    all_findings = _unpack_findings(input.get("all_findings", []))
+    # Instances continued before queries were fanned out carry a single
+    # current_query instead
+    current_queries: List[str] = input.get("current_queries") or (
+        [input["current_query"]] if "current_query" in input else [topic]
+    )
+    # Citation registry of every analyzed paper; its keys are also the papers
+    # later iterations skip
+    all_citations: Dict[str, Dict[str, Any]] = input.get("all_citations", {})
 
     # Log start of research on first iteration
     if current_iteration == 0:
@@ -158,20 +267,50 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
     # Check if we've reached max iterations - synthesize and return
     if current_iteration >= max_iterations:
         return (yield from _synthesize_and_return(
-            ctx, topic, all_findings, current_iteration,
+            ctx, topic, all_findings, all_citations, current_iteration,
             "Max iterations reached, synthesizing research report..."
         ))
 
     # Increment iteration counter
     current_iteration += 1
     logger.info(f"Starting iteration {current_iteration}/{max_iterations}")
+    seen_arxiv_ids = list(all_citations)
 
-    # Research papers for the current query using a sub-orchestration
-    analysis = yield ctx.call_sub_orchestrator(
-        "paper_research_orchestrator",
-        input={"main_topic": topic, "query": current_query}
-    )
-    all_findings.append(analysis)
+    research_inputs = [
+        {"main_topic": topic, "query": query, "seen_ids": seen_arxiv_ids}
+        for query in current_queries
+    ]
+    if len(current_queries) > 1:
+        # Fetch papers for all queries with one combined arXiv request instead
+        # of one rate-limited request per query
+        papers_by_query = yield ctx.call_activity(
+            "search_arxiv_multi_activity",
+            input=current_queries,
+            retry_policy=ARXIV_RETRY_POLICY
+        )
+        for research_input in research_inputs:
+            research_input["papers"] = papers_by_query.get(research_input["query"], [])
+
+    # Fan out: research every query in parallel
+    analyses = yield task.when_all([
+        ctx.call_sub_orchestrator("paper_research_orchestrator", input=research_input)
+        for research_input in research_inputs
+    ])
+
+    # Number newly cited papers in discovery order and keep the findings lean
+    for analysis in analyses:
+        for arxiv_id, citation in analysis.pop("new_citations", {}).items():
+            if arxiv_id not in all_citations:
+                all_citations[arxiv_id] = {"id": len(all_citations) + 1, **citation}
+    all_findings.extend(_compact_findings(analyses))
+
+    # The next instance would synthesize immediately, so skip the decision and
+    # follow-up query calls after the final iteration
+    if current_iteration >= max_iterations:
+        return (yield from _synthesize_and_return(
+            ctx, topic, all_findings, all_citations, current_iteration,
+            "Final iteration completed, synthesizing research report..."
+        ))
 
     # Decide whether to continue the literature review
     should_continue = yield ctx.call_activity(
@@ -187,12 +326,12 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
 
     if not should_continue:
         return (yield from _synthesize_and_return(
-            ctx, topic, all_findings, current_iteration,
+            ctx, topic, all_findings, all_citations, current_iteration,
             "Concluding research early based on LLM decision"
         ))
 
-    # Generate next research query based on gaps identified
-    follow_up_query = yield ctx.call_activity(
+    # Generate next research queries based on gaps identified
+    follow_up_queries = yield ctx.call_activity(
         "identify_research_gaps_activity",
         input={
             "topic": topic,
@@ -202,18 +341,20 @@ def arxiv_research_orchestrator(ctx: task.OrchestrationContext, input: Dict[str,
         retry_policy=LLM_RETRY_POLICY
     )
 
-    if not follow_up_query:
+    if not follow_up_queries:
         return (yield from _synthesize_and_return(
-            ctx, topic, all_findings, current_iteration,
+            ctx, topic, all_findings, all_citations, current_iteration,
             "No additional research gaps identified, concluding..."
         ))
 
     # Continue as new with updated state (resets history)
-    logger.info(f"Continuing to next iteration with query: '{follow_up_query}'")
+    follow_up_queries = follow_up_queries[:PARALLEL_FANOUT]
+    logger.info(f"Continuing to next iteration with queries: {follow_up_queries}")
     ctx.continue_as_new({
         "topic": topic,
         "max_iterations": max_iterations,
         "current_iteration": current_iteration,
-        "all_findings": all_findings,
-        "current_query": follow_up_query
+        "all_findings": _pack_findings(all_findings),
+        "current_queries": follow_up_queries,
+        "all_citations": all_citations
     })
@@ -0,0 +1,43 @@
+"""Payload serialization for the arXiv Research Agent's orchestrations."""
+
+from typing import Any, Optional
+
+import orjson
+from durabletask.serialization import JsonDataConverter
+
+# Marker older SDK versions wrote into object payloads; the SDK decoder turns
+# such objects back into SimpleNamespace instances when histories replay
+_LEGACY_OBJECT_MARKER = "__durabletask_autoobject__"
+
+
+class OrjsonDataConverter(JsonDataConverter):
+    """DurableTask data converter that encodes and decodes payloads with orjson.
+
+    Orchestration state (findings, papers, citations) is plain JSON data that is
+    serialized at every checkpoint and continue_as_new, so it goes through
+    orjson's C codec. Values orjson cannot encode, and typed reconstruction via
+    target_type, fall back to the SDK's default JSON converter. So do payloads
+    that may carry the SDK's legacy object marker or that orjson cannot parse
+    (e.g. the NaN/Infinity literals the stdlib encoder writes), so histories
+    written by the default converter replay with the same values.
+    """
+
+    def serialize(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            return super().serialize(value)
+
+    def deserialize(self, data: Optional[str], target_type: Optional[type] = None) -> Any:
+        if data and target_type is None and _LEGACY_OBJECT_MARKER not in data:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return super().deserialize(data, target_type)
+
+
+# Shared by the worker and the API client so both sides agree on the format
+data_converter = OrjsonDataConverter()
@@ -7,14 +7,22 @@ tasks from the Durable Task Scheduler.
 import asyncio
 import logging
 import os
+import signal
 import sys
 
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+from azure.identity import (
+    AzureCliCredential,
+    ChainedTokenCredential,
+    EnvironmentCredential,
+    ManagedIdentityCredential,
+)
 from durabletask.azuremanaged.worker import DurableTaskSchedulerWorker
 
 from .activities import (
     search_arxiv_activity,
+    search_arxiv_multi_activity,
     analyze_papers_activity,
+    merge_analyses_activity,
     identify_research_gaps_activity,
     decide_continuation_activity,
     synthesize_research_activity,
@@ -23,6 +31,7 @@ from .orchestrations import (
     paper_research_orchestrator,
     arxiv_research_orchestrator,
 )
+from .serialization import data_converter
 
 # Configure logging
 logging.basicConfig(
@@ -31,29 +40,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Credential created by get_credential; only set once creation succeeds
+_credential = None
+
 
 def get_credential():
     """Get Azure credential for authentication.
     
+    The credential is created once and reused; a failed attempt is not
+    remembered, so the next call tries again.
+    
     Returns:
         Credential object or None for local emulator
     """
+    global _credential
+    
     endpoint = os.getenv("ENDPOINT", "http://localhost:8080")
     
     if endpoint == "http://localhost:8080":
         return None
     
+    if _credential is not None:
+        return _credential
+    
     try:
         client_id = os.getenv("AZURE_MANAGED_IDENTITY_CLIENT_ID")
         if client_id:
             logger.info(f"Using Managed Identity with client ID: {client_id}")
-            credential = ManagedIdentityCredential(client_id=client_id)
-            credential.get_token("https://management.azure.com/.default")
-            logger.info("Successfully authenticated with Managed Identity")
-            return credential
+            # No eager get_token: the scheduler's auth interceptor fetches a token
+            # for its own scope on the first call and caches it
+            _credential = ManagedIdentityCredential(client_id=client_id)
         else:
-            logger.info("Using DefaultAzureCredential")
-            return DefaultAzureCredential()
+            # Only the providers a deployed worker or API actually uses, instead
+            # of DefaultAzureCredential probing every developer tool in turn
+            logger.info("Using managed identity, environment or Azure CLI credentials")
+            _credential = ChainedTokenCredential(
+                ManagedIdentityCredential(),
+                EnvironmentCredential(),
+                AzureCliCredential(),
+            )
+        return _credential
     except Exception as e:
         logger.error(f"Authentication error: {e}")
         logger.warning("Continuing without authentication - this may only work with local emulator")
@@ -78,11 +104,14 @@ async def main():
         host_address=endpoint,
         secure_channel=endpoint != "http://localhost:8080",
         taskhub=taskhub_name,
-        token_credential=credential
+        token_credential=credential,
+        data_converter=data_converter
     ) as worker:
         # Register activities
         worker.add_activity(search_arxiv_activity)
+        worker.add_activity(search_arxiv_multi_activity)
         worker.add_activity(analyze_papers_activity)
+        worker.add_activity(merge_analyses_activity)
         worker.add_activity(identify_research_gaps_activity)
         worker.add_activity(decide_continuation_activity)
         worker.add_activity(synthesize_research_activity)
@@ -97,13 +126,19 @@ async def main():
         # Start the worker
         worker.start()
         
-        try:
-            # Keep the worker running
-            logger.info("Worker is running. Press Ctrl+C to stop.")
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("Worker shutdown initiated")
+        # Park until SIGINT/SIGTERM instead of waking up periodically
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows: Ctrl+C still raises KeyboardInterrupt
+                pass
+        
+        logger.info("Worker is running. Press Ctrl+C to stop.")
+        await stop.wait()
+        logger.info("Worker shutdown initiated")
+        worker.stop()
     
     logger.info("Worker stopped")
 
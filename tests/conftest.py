@@ -1,34 +1,61 @@
 """Pytest configuration and fixtures for tests."""
 
+import copy
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-import os
+import respx
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_env_vars():
+    """Set default environment variables once per test session (or xdist worker)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        mp.setenv("AZURE_OPENAI_API_KEY", "test-api-key")
+        mp.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+        mp.setenv("ENDPOINT", "http://localhost:8080")
+        mp.setenv("TASKHUB", "default")
+        yield
 
 
 @pytest.fixture(autouse=True)
-def mock_env_vars(monkeypatch):
-    """Set default environment variables for tests."""
-    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
-    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-api-key")
-    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
-    monkeypatch.setenv("ENDPOINT", "http://localhost:8080")
-    monkeypatch.setenv("TASKHUB", "default")
+def clear_llm_response_cache():
+    """Keep cached LLM responses from leaking between tests."""
+    from arxiv_research_agent import llm
+    llm._response_cache.clear()
+    yield
+    llm._response_cache.clear()
 
 
-@pytest.fixture
-def mock_openai_client():
-    """Mock OpenAI client for LLM tests (Responses API)."""
-    with patch("arxiv_research_agent.llm.client") as mock_client:
-        mock_response = Mock()
-        mock_response.output_text = '{"test": "response"}'
-        mock_client.responses.create.return_value = mock_response
-        yield mock_client
+@pytest.fixture(scope="session")
+def shared_openai_client():
+    """One mock OpenAI client (Responses API) built for the whole session."""
+    mock_client = MagicMock()
+    mock_client.responses.create.return_value = Mock()
+    return mock_client
 
 
 @pytest.fixture
+def mock_openai_client(shared_openai_client, monkeypatch):
+    """Mock OpenAI client for LLM tests, with calls and the default response reset."""
+    from arxiv_research_agent import llm
+    shared_openai_client.reset_mock(side_effect=True)
+    mock_response = shared_openai_client.responses.create.return_value
+    mock_response.output = []
+    mock_response.output_text = '{"test": "response"}'
+    monkeypatch.setattr(llm, "client", shared_openai_client)
+    return shared_openai_client
+
+
+@pytest.fixture(scope="session")
 def sample_papers():
-    """Sample arXiv papers for testing."""
-    return [
+    """Sample arXiv papers for testing.
+
+    Shared by the whole session, so the papers are read-only; use
+    sample_papers_mutable to get a private, editable copy.
+    """
+    papers = [
         {
             "arxiv_id": "2301.12345v1",
             "title": "Deep Learning for Natural Language Processing",
@@ -60,12 +87,19 @@ def sample_papers():
             "doi": "10.1109/ICRA.2023.12345",
         },
     ]
+    return tuple(MappingProxyType(paper) for paper in papers)
 
 
 @pytest.fixture
+def sample_papers_mutable(sample_papers):
+    """Editable copy of sample_papers for tests that modify papers."""
+    return [copy.deepcopy(dict(paper)) for paper in sample_papers]
+
+
+@pytest.fixture(scope="session")
 def sample_evaluation_result():
-    """Sample evaluation result for testing."""
-    return {
+    """Sample evaluation result for testing (shared and read-only)."""
+    return MappingProxyType({
         "query": "deep learning NLP",
         "insights": ["Transformers outperform RNNs", "Attention mechanisms are key"],
         "relevance_score": 8,
@@ -73,28 +107,41 @@ def sample_evaluation_result():
         "key_points": ["Transformer architecture", "Pre-training benefits"],
         "research_gaps": ["Efficiency improvements needed", "Multilingual models underexplored"],
         "top_papers": [],
-    }
+    })
+
+
+@pytest.fixture(scope="module")
+def arxiv_router():
+    """respx router with a single arXiv API route, registered once per module."""
+    from arxiv_research_agent.arxiv_api import ARXIV_API_URL
+    with respx.mock(assert_all_called=False) as router:
+        router.get(ARXIV_API_URL, name="arxiv")
+        yield router
 
 
 @pytest.fixture
-def mock_httpx_client():
-    """Mock httpx client for API tests."""
-    with patch("arxiv_research_agent.arxiv_api._get_client") as mock_get_client:
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-        yield mock_client
+def arxiv_route(arxiv_router):
+    """The shared arXiv route, cleared of calls and responses after each test."""
+    route = arxiv_router["arxiv"]
+    yield route
+    route.reset()
+    route.return_value = None
+    route.side_effect = None
 
 
 @pytest.fixture
 def mock_activity_context():
-    """Mock DurableTask activity context."""
-    return Mock()
+    """Stand-in DurableTask activity context (activities never read it)."""
+    return SimpleNamespace()
 
 
 @pytest.fixture
 def mock_orchestration_context():
-    """Mock DurableTask orchestration context."""
-    ctx = Mock()
-    ctx.call_activity = Mock()
-    ctx.call_sub_orchestrator = Mock()
-    return ctx
+    """Stand-in DurableTask orchestration context with no-op calls.
+
+    Tests that assert on calls should use a Mock instead.
+    """
+    return SimpleNamespace(
+        call_activity=lambda *args, **kwargs: None,
+        call_sub_orchestrator=lambda *args, **kwargs: None,
+    )
@@ -5,10 +5,15 @@ from unittest.mock import patch, Mock
 
 from arxiv_research_agent.activities import (
     search_arxiv_activity,
+    search_arxiv_multi_activity,
     analyze_papers_activity,
+    merge_analyses_activity,
     identify_research_gaps_activity,
     decide_continuation_activity,
     synthesize_research_activity,
+    _truncate_tokens,
+    MAX_PAPERS_TO_ANALYZE,
+    SEARCH_RESULTS_PER_QUERY,
 )
 
 
@@ -18,12 +23,12 @@ class TestSearchArxivActivity:
     @patch("arxiv_research_agent.activities.search_arxiv")
     def test_search_returns_papers(self, mock_search, mock_activity_context, sample_papers):
         """Test that activity returns papers from API."""
-        mock_search.return_value = sample_papers
+        mock_search.return_value = list(sample_papers)
         
         result = search_arxiv_activity(mock_activity_context, "deep learning")
         
-        assert result == sample_papers
-        mock_search.assert_called_once_with("deep learning", max_results=30)
+        assert result == list(sample_papers)
+        mock_search.assert_called_once_with("deep learning", max_results=SEARCH_RESULTS_PER_QUERY)
 
     @patch("arxiv_research_agent.activities.search_arxiv")
     def test_search_empty_results(self, mock_search, mock_activity_context):
@@ -35,6 +40,22 @@ class TestSearchArxivActivity:
         assert result == []
 
 
+class TestSearchArxivMultiActivity:
+    """Tests for search_arxiv_multi_activity."""
+
+    @patch("arxiv_research_agent.activities.search_arxiv_multi")
+    def test_search_multi_returns_papers_by_query(
+        self, mock_search, mock_activity_context, sample_papers
+    ):
+        """Test that activity returns papers grouped by query."""
+        mock_search.return_value = {"q1": sample_papers, "q2": []}
+
+        result = search_arxiv_multi_activity(mock_activity_context, ["q1", "q2"])
+
+        assert result == {"q1": sample_papers, "q2": []}
+        mock_search.assert_called_once_with(["q1", "q2"], per_query=MAX_PAPERS_TO_ANALYZE)
+
+
 class TestAnalyzePapersActivity:
     """Tests for analyze_papers_activity."""
 
@@ -69,6 +90,7 @@ class TestAnalyzePapersActivity:
         assert "query" in result
         assert "top_papers" in result
         assert result["query"] == "transformer attention"
+        assert mock_llm.call_args.kwargs["use_semantic_cache"] is False
 
     @patch("arxiv_research_agent.activities.call_llm")
     @patch("arxiv_research_agent.activities.parse_json_response")
@@ -99,20 +121,127 @@ class TestAnalyzePapersActivity:
         
         assert result is not None
 
+    @patch("arxiv_research_agent.activities.call_llm")
+    def test_analyze_keeps_system_prompt_static(
+        self,
+        mock_llm,
+        mock_activity_context,
+        sample_papers
+    ):
+        """Test that dynamic content stays out of the cacheable system prompt."""
+        mock_llm.return_value = '{}'
+
+        for topic in ("deep learning", "robotics"):
+            analyze_papers_activity(
+                mock_activity_context,
+                {"topic": topic, "query": topic, "papers": sample_papers}
+            )
+
+        first, second = (c.args[0] for c in mock_llm.call_args_list)
+        assert first[0] == second[0]
+        assert "robotics" not in first[0]["content"]
+        assert second[1]["content"].startswith("Topic: robotics")
+
+
+class TestMergeAnalysesActivity:
+    """Tests for merge_analyses_activity function."""
+
+    def test_merges_partial_analyses(self, mock_activity_context):
+        """Test partial analyses are concatenated and scores weighted by paper count."""
+        partials = [
+            {
+                "query": "q",
+                "insights": ["i1", "shared"],
+                "relevance_score": 9,
+                "summary": "First chunk.",
+                "key_points": ["k1"],
+                "research_gaps": ["g1"],
+                "top_papers": [{"arxiv_id": "1"}, {"arxiv_id": "2"}, {"arxiv_id": "3"}],
+                "new_citations": {"1": {}, "2": {}, "3": {}},
+            },
+            {
+                "query": "q",
+                "insights": ["shared", "i2"],
+                "relevance_score": 5,
+                "summary": "Second chunk.",
+                "key_points": ["k2"],
+                "research_gaps": [],
+                "top_papers": [{"arxiv_id": "4"}],
+                "new_citations": {"4": {}},
+            },
+        ]
+
+        result = merge_analyses_activity(
+            mock_activity_context, {"query": "q", "analyses": partials}
+        )
+
+        assert result["query"] == "q"
+        assert result["insights"] == ["i1", "shared", "i2"]
+        assert result["key_points"] == ["k1", "k2"]
+        assert result["research_gaps"] == ["g1"]
+        assert result["summary"] == "First chunk. Second chunk."
+        assert result["relevance_score"] == 8
+        assert [p["arxiv_id"] for p in result["top_papers"]] == ["1", "2", "3", "4"]
+        assert list(result["new_citations"]) == ["1", "2", "3", "4"]
+
+    def test_ignores_chunks_without_papers(self, mock_activity_context):
+        """Test chunks whose papers were all seen do not affect the merge."""
+        partials = [
+            {"query": "q", "insights": [], "relevance_score": 0, "summary": "No new papers found for this query",
+             "key_points": [], "research_gaps": [], "top_papers": []},
+            {"query": "q", "insights": ["i"], "relevance_score": 7, "summary": "s",
+             "key_points": [], "research_gaps": [], "top_papers": [{"arxiv_id": "1"}],
+             "new_citations": {"1": {}}},
+        ]
+
+        result = merge_analyses_activity(
+            mock_activity_context, {"query": "q", "analyses": partials}
+        )
+
+        assert result["relevance_score"] == 7
+        assert result["summary"] == "s"
+
+    def test_all_chunks_empty(self, mock_activity_context):
+        """Test an empty analysis is returned when no chunk had papers."""
+        result = merge_analyses_activity(
+            mock_activity_context, {"query": "q", "analyses": []}
+        )
+
+        assert result["relevance_score"] == 0
+        assert result["top_papers"] == []
+
+
+@patch("arxiv_research_agent.activities._get_encoding", return_value=None)
+class TestTruncateTokens:
+    """Tests for _truncate_tokens using the character-based estimate."""
+
+    def test_short_text_unchanged(self, mock_encoding):
+        """Test that text within budget is returned as-is."""
+        assert _truncate_tokens("Short abstract.", 10) == "Short abstract."
+
+    def test_cuts_at_sentence_boundary(self, mock_encoding):
+        """Test that long text is cut after the last complete sentence."""
+        text = "First sentence here. Second sentence is much longer and gets cut off."
+        assert _truncate_tokens(text, 10) == "First sentence here."
+
+    def test_no_sentence_boundary_adds_ellipsis(self, mock_encoding):
+        """Test that text without a sentence break is cut and marked."""
+        assert _truncate_tokens("abcdefghijklmnop", 2) == "abcdefgh..."
+
 
 class TestIdentifyResearchGapsActivity:
     """Tests for identify_research_gaps_activity."""
 
     @patch("arxiv_research_agent.activities.call_llm")
     @patch("arxiv_research_agent.activities.parse_json_response")
-    def test_identify_returns_query(
+    def test_identify_returns_queries(
         self,
         mock_parse,
         mock_llm,
         mock_activity_context,
         sample_evaluation_result
     ):
-        """Test that activity returns a follow-up query."""
+        """Test that activity returns all follow-up queries."""
         mock_llm.return_value = '["transformer attention", "neural network optimization"]'
         mock_parse.return_value = ["transformer attention", "neural network optimization"]
         
@@ -125,7 +254,8 @@ class TestIdentifyResearchGapsActivity:
             }
         )
         
-        assert result == "transformer attention"
+        assert result == ["transformer attention", "neural network optimization"]
+        assert mock_llm.call_args.kwargs["use_semantic_cache"] is False
 
     @patch("arxiv_research_agent.activities.call_llm")
     @patch("arxiv_research_agent.activities.parse_json_response")
@@ -149,7 +279,7 @@ class TestIdentifyResearchGapsActivity:
             }
         )
         
-        assert result is None
+        assert result == []
 
     @patch("arxiv_research_agent.activities.call_llm")
     @patch("arxiv_research_agent.activities.parse_json_response")
@@ -173,7 +303,7 @@ class TestIdentifyResearchGapsActivity:
             }
         )
         
-        assert result is None
+        assert result == []
 
 
 class TestDecideContinuationActivity:
@@ -191,18 +321,20 @@ class TestDecideContinuationActivity:
         """Test that activity returns True when should continue."""
         mock_llm.return_value = '{"should_continue": true}'
         mock_parse.return_value = {"should_continue": True}
+        finding = {**sample_evaluation_result, "relevance_score": 6}
         
         result = decide_continuation_activity(
             mock_activity_context,
             {
                 "topic": "deep learning",
-                "all_findings": [sample_evaluation_result],
+                "all_findings": [finding],
                 "current_iteration": 1,
                 "max_iterations": 3
             }
         )
         
         assert result is True
+        mock_llm.assert_called_once()
 
     @patch("arxiv_research_agent.activities.call_llm")
     @patch("arxiv_research_agent.activities.parse_json_response")
@@ -216,18 +348,87 @@ class TestDecideContinuationActivity:
         """Test that activity returns False when should stop."""
         mock_llm.return_value = '{"should_continue": false}'
         mock_parse.return_value = {"should_continue": False}
+        finding = {**sample_evaluation_result, "relevance_score": 6}
         
         result = decide_continuation_activity(
             mock_activity_context,
             {
                 "topic": "deep learning",
-                "all_findings": [sample_evaluation_result],
+                "all_findings": [finding],
                 "current_iteration": 2,
                 "max_iterations": 3
             }
         )
         
         assert result is False
+        mock_llm.assert_called_once()
+
+    @patch("arxiv_research_agent.activities.call_llm")
+    def test_decide_early_iteration_skips_llm(
+        self,
+        mock_llm,
+        mock_activity_context,
+        sample_evaluation_result
+    ):
+        """Test that the first quarter of iterations always continues."""
+        finding = {**sample_evaluation_result, "relevance_score": 2}
+
+        result = decide_continuation_activity(
+            mock_activity_context,
+            {
+                "topic": "deep learning",
+                "all_findings": [finding],
+                "current_iteration": 1,
+                "max_iterations": 8
+            }
+        )
+
+        assert result is True
+        mock_llm.assert_not_called()
+
+    @patch("arxiv_research_agent.activities.call_llm")
+    def test_decide_high_relevance_skips_llm(
+        self,
+        mock_llm,
+        mock_activity_context,
+        sample_evaluation_result
+    ):
+        """Test that highly relevant findings continue without an LLM call."""
+        result = decide_continuation_activity(
+            mock_activity_context,
+            {
+                "topic": "deep learning",
+                "all_findings": [sample_evaluation_result],
+                "current_iteration": 1,
+                "max_iterations": 3
+            }
+        )
+
+        assert result is True
+        mock_llm.assert_not_called()
+
+    @patch("arxiv_research_agent.activities.call_llm")
+    def test_decide_low_relevance_skips_llm(
+        self,
+        mock_llm,
+        mock_activity_context,
+        sample_evaluation_result
+    ):
+        """Test that consistently irrelevant findings stop without an LLM call."""
+        finding = {**sample_evaluation_result, "relevance_score": 3}
+
+        result = decide_continuation_activity(
+            mock_activity_context,
+            {
+                "topic": "deep learning",
+                "all_findings": [finding, finding],
+                "current_iteration": 2,
+                "max_iterations": 3
+            }
+        )
+
+        assert result is False
+        mock_llm.assert_not_called()
 
     def test_decide_max_iterations_reached(
         self,
@@ -252,17 +453,14 @@ class TestSynthesizeResearchActivity:
     """Tests for synthesize_research_activity."""
 
     @patch("arxiv_research_agent.activities.call_llm")
-    @patch("arxiv_research_agent.activities.parse_json_response")
     def test_synthesize_returns_report(
         self,
-        mock_parse,
         mock_llm,
         mock_activity_context,
         sample_evaluation_result
     ):
-        """Test that activity returns a report string."""
-        mock_llm.return_value = '{"report": "This is the final research report."}'
-        mock_parse.return_value = {"report": "This is the final research report."}
+        """Test that activity returns the plain-text report."""
+        mock_llm.return_value = "# Report\n\nThis is the final research report.\n"
         
         result = synthesize_research_activity(
             mock_activity_context,
@@ -272,20 +470,18 @@ class TestSynthesizeResearchActivity:
             }
         )
         
-        assert result == "This is the final research report."
+        assert result == "# Report\n\nThis is the final research report."
+        assert mock_llm.call_args.kwargs["json_output"] is False
 
     @patch("arxiv_research_agent.activities.call_llm")
-    @patch("arxiv_research_agent.activities.parse_json_response")
-    def test_synthesize_handles_missing_report(
+    def test_synthesize_handles_empty_report(
         self,
-        mock_parse,
         mock_llm,
         mock_activity_context,
         sample_evaluation_result
     ):
-        """Test that activity handles missing report key."""
-        mock_llm.return_value = '{}'
-        mock_parse.return_value = {}
+        """Test that activity handles an empty response."""
+        mock_llm.return_value = "  \n"
         
         result = synthesize_research_activity(
             mock_activity_context,
@@ -296,3 +492,38 @@ class TestSynthesizeResearchActivity:
         )
         
         assert result == "No report generated"
+
+    @patch("arxiv_research_agent.activities.call_llm")
+    def test_synthesize_formats_citations(
+        self,
+        mock_llm,
+        mock_activity_context,
+        sample_evaluation_result
+    ):
+        """Test that pre-numbered citations are listed in the prompt."""
+        mock_llm.return_value = '{"report": "report"}'
+
+        synthesize_research_activity(
+            mock_activity_context,
+            {
+                "topic": "deep learning",
+                "all_findings": [sample_evaluation_result],
+                "citations": {
+                    "2301.12345v1": {
+                        "id": 1,
+                        "title": "Attention Is All You Need",
+                        "authors": "John Smith et al.",
+                        "abs_url": "http://arxiv.org/abs/2301.12345v1",
+                        "pdf_url": "",
+                        "published": "2023-01-15",
+                        "categories": [],
+                    },
+                },
+            }
+        )
+
+        prompt = mock_llm.call_args.args[0][1]["content"]
+        assert (
+            '[1] John Smith et al.: "Attention Is All You Need" (2023-01-15)'
+            " - http://arxiv.org/abs/2301.12345v1"
+        ) in prompt
@@ -1,12 +1,15 @@
 """Tests for arXiv API utilities."""
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock
 import httpx
 
+from arxiv_research_agent import arxiv_api
 from arxiv_research_agent.arxiv_api import (
     search_arxiv,
     search_arxiv_by_category,
+    search_arxiv_iter,
+    search_arxiv_multi,
     get_paper_by_id,
     ArxivAPIError,
     ARXIV_API_URL,
@@ -38,16 +41,57 @@ EMPTY_ARXIV_XML = """<?xml version="1.0" encoding="UTF-8"?>
 <feed xmlns="http://www.w3.org/2005/Atom">
 </feed>"""
 
+TWO_PAPER_ARXIV_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/2301.00001v1</id>
+    <title>Transformer Attention Mechanisms</title>
+    <summary>Attention in transformers.</summary>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2301.00002v1</id>
+    <title>Federated Learning Privacy</title>
+    <summary>Privacy for federated learning.</summary>
+  </entry>
+</feed>"""
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limit(monkeypatch):
+    """Let each test's first request go out immediately.
+
+    Otherwise every test waits out the RATE_LIMIT_DELAY slot reserved by the
+    previous test's request, which dominates this module's run time.
+    """
+    monkeypatch.setattr(arxiv_api, "_next_allowed_time", 0.0)
+
+
+def _response(xml: str) -> httpx.Response:
+    """Successful arXiv response carrying the given feed."""
+    return httpx.Response(200, content=xml.encode())
+
+
+@pytest.fixture(scope="module")
+def sample_response():
+    return _response(SAMPLE_ARXIV_XML)
+
+
+@pytest.fixture(scope="module")
+def empty_response():
+    return _response(EMPTY_ARXIV_XML)
+
+
+@pytest.fixture(scope="module")
+def two_paper_response():
+    return _response(TWO_PAPER_ARXIV_XML)
+
 
 class TestSearchArxiv:
     """Tests for search_arxiv function."""
 
-    def test_search_success(self, mock_httpx_client):
+    def test_search_success(self, arxiv_route, sample_response):
         """Test successful search."""
-        mock_response = Mock()
-        mock_response.text = SAMPLE_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = sample_response
         
         result = search_arxiv("machine learning")
         
@@ -55,135 +99,242 @@ class TestSearchArxiv:
         assert result[0]["title"] == "Test Paper About Machine Learning"
         assert result[0]["arxiv_id"] == "2301.12345v1"
         assert "John Smith" in result[0]["authors"]
-        mock_httpx_client.get.assert_called_once()
+        assert arxiv_route.call_count == 1
+
+    def test_search_parses_entry_fields(self, arxiv_route, sample_response):
+        """Test that all entry fields are extracted from the feed."""
+        arxiv_route.return_value = sample_response
+
+        paper = search_arxiv("machine learning")[0]
+
+        assert paper["summary"] == "This paper presents a novel approach to machine learning."
+        assert paper["authors"] == ["John Smith", "Jane Doe"]
+        assert paper["published"] == "2023-01-15T00:00:00Z"
+        assert paper["categories"] == ["cs.LG", "cs.AI"]
+        assert paper["primary_category"] == "cs.LG"
+        assert paper["pdf_url"] == "http://arxiv.org/pdf/2301.12345v1"
+        assert paper["abs_url"] == "http://arxiv.org/abs/2301.12345v1"
+        assert paper["comment"] == "12 pages, 5 figures"
+        assert paper["doi"] == ""
 
-    def test_search_with_max_results(self, mock_httpx_client):
+    def test_search_with_max_results(self, arxiv_route, empty_response):
         """Test search with custom max_results."""
-        mock_response = Mock()
-        mock_response.text = EMPTY_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = empty_response
         
         search_arxiv("test", max_results=50)
         
-        call_args = mock_httpx_client.get.call_args
-        assert call_args.kwargs["params"]["max_results"] == 50
-
-    def test_search_empty_query_raises(self):
-        """Test that empty query raises ValueError."""
+        assert arxiv_route.calls.last.request.url.params["max_results"] == "50"
+
+    @pytest.mark.parametrize("kwargs, message", [
+        ({"query": ""}, "query cannot be empty"),
+        ({"query": "   "}, "query cannot be empty"),
+        ({"max_results": 0}, "max_results must be between 1 and 100"),
+        ({"max_results": 101}, "max_results must be between 1 and 100"),
+        ({"sort_by": "invalid"}, "sort_by must be"),
+        ({"sort_order": "invalid"}, "sort_order must be"),
+    ])
+    def test_search_invalid_arguments_raise(self, kwargs, message):
+        """Test that invalid arguments raise ValueError."""
         with pytest.raises(ValueError) as exc_info:
-            search_arxiv("")
+            search_arxiv(**{"query": "test", **kwargs})
         
-        assert "query cannot be empty" in str(exc_info.value)
-
-    def test_search_whitespace_query_raises(self):
-        """Test that whitespace-only query raises ValueError."""
-        with pytest.raises(ValueError) as exc_info:
-            search_arxiv("   ")
+        assert message in str(exc_info.value)
+
+    @pytest.mark.parametrize("outcome, message", [
+        (httpx.TimeoutException("Timeout"), "Request timed out"),
+        (httpx.Response(500), "HTTP error"),
+        (httpx.ConnectError("Network error"), "Network error"),
+    ], ids=["timeout", "http-error", "network-error"])
+    def test_search_request_errors(self, arxiv_route, outcome, message):
+        """Test that request failures raise ArxivAPIError."""
+        arxiv_route.side_effect = [outcome]
         
-        assert "query cannot be empty" in str(exc_info.value)
-
-    def test_search_max_results_too_low_raises(self):
-        """Test that max_results < 1 raises ValueError."""
-        with pytest.raises(ValueError) as exc_info:
-            search_arxiv("test", max_results=0)
+        with pytest.raises(ArxivAPIError) as exc_info:
+            search_arxiv("test")
         
-        assert "max_results must be between 1 and 100" in str(exc_info.value)
+        assert message in str(exc_info.value)
 
-    def test_search_max_results_too_high_raises(self):
-        """Test that max_results > 100 raises ValueError."""
-        with pytest.raises(ValueError) as exc_info:
-            search_arxiv("test", max_results=101)
+    def test_search_strips_whitespace(self, arxiv_route, empty_response):
+        """Test that query whitespace is stripped."""
+        arxiv_route.return_value = empty_response
         
-        assert "max_results must be between 1 and 100" in str(exc_info.value)
-
-    def test_search_invalid_sort_by_raises(self):
-        """Test that invalid sort_by raises ValueError."""
-        with pytest.raises(ValueError) as exc_info:
-            search_arxiv("test", sort_by="invalid")
+        search_arxiv("  machine learning  ")
         
-        assert "sort_by must be" in str(exc_info.value)
+        params = arxiv_route.calls.last.request.url.params
+        assert params["search_query"] == "all:machine learning"
+
+
+class TestSearchArxivIter:
+    """Tests for search_arxiv_iter function."""
+
+    def test_iter_is_lazy(self, arxiv_route, two_paper_response):
+        """Test that no request is made until iteration starts."""
+        arxiv_route.return_value = two_paper_response
+
+        papers = search_arxiv_iter("transformers")
+        assert not arxiv_route.called
+
+        assert next(papers)["arxiv_id"] == "2301.00001v1"
+        assert arxiv_route.call_count == 1
+
+    def test_entry_id_without_abs_path_is_kept(self):
+        """Test that an entry id that isn't an abs URL is used as the arxiv_id."""
+        feed = TWO_PAPER_ARXIV_XML.replace("http://arxiv.org/abs/2301.00001v1", "2301.00001v1")
+
+        papers = list(arxiv_api._iter_feed(feed.encode()))
+
+        assert [p["arxiv_id"] for p in papers] == ["2301.00001v1", "2301.00002v1"]
+
+    def test_feed_entries_are_parsed_in_order(self):
+        """Test that dropping parsed entries from the tree keeps every entry."""
+        papers = arxiv_api._iter_feed(TWO_PAPER_ARXIV_XML.encode())
+
+        assert [p["arxiv_id"] for p in papers] == ["2301.00001v1", "2301.00002v1"]
+
+    def test_iter_validates_eagerly(self):
+        """Test that invalid parameters raise before iteration."""
+        with pytest.raises(ValueError):
+            search_arxiv_iter("")
+
+    def test_iter_wraps_errors(self, arxiv_route):
+        """Test that request errors surface as ArxivAPIError during iteration."""
+        arxiv_route.side_effect = httpx.TimeoutException("Timeout")
+
+        with pytest.raises(ArxivAPIError):
+            list(search_arxiv_iter("test"))
+
+
+class TestSearchArxivMulti:
+    """Tests for search_arxiv_multi function."""
+
+    def test_multi_combines_queries_into_one_request(self, arxiv_route, empty_response):
+        """Test that all queries are sent in a single OR query."""
+        arxiv_route.return_value = empty_response
+
+        search_arxiv_multi(["transformer attention", " federated learning "], per_query=20)
+
+        assert arxiv_route.call_count == 1
+        params = arxiv_route.calls.last.request.url.params
+        assert params["search_query"] == "(all:transformer attention) OR (all:federated learning)"
+        assert params["max_results"] == "40"
+
+    def test_multi_partitions_results_by_query(self, arxiv_route, two_paper_response):
+        """Test that papers are assigned to the query they match best."""
+        arxiv_route.return_value = two_paper_response
+
+        result = search_arxiv_multi(["transformer attention", "federated privacy"])
+
+        assert [p["arxiv_id"] for p in result["transformer attention"]] == ["2301.00001v1"]
+        assert [p["arxiv_id"] for p in result["federated privacy"]] == ["2301.00002v1"]
+
+    def test_multi_assigns_tied_paper_to_one_query(self, arxiv_route, two_paper_response):
+        """Test that a paper matching two queries equally is only returned once."""
+        arxiv_route.return_value = two_paper_response
+
+        result = search_arxiv_multi(["federated", "privacy"])
 
-    def test_search_invalid_sort_order_raises(self):
-        """Test that invalid sort_order raises ValueError."""
+        assert [p["arxiv_id"] for p in result["federated"]] == ["2301.00002v1"]
+        assert result["privacy"] == []
+
+    def test_multi_caps_max_results(self, arxiv_route, empty_response):
+        """Test that the combined request never asks for more than the API limit."""
+        arxiv_route.return_value = empty_response
+
+        search_arxiv_multi(["q1", "q2", "q3"], per_query=50)
+
+        params = arxiv_route.calls.last.request.url.params
+        assert params["max_results"] == str(arxiv_api.MAX_RESULTS_PER_REQUEST)
+
+    def test_multi_matches_whole_words_without_stopwords(self, arxiv_route, two_paper_response):
+        """Test that stopwords and substrings do not assign papers to a query."""
+        arxiv_route.return_value = two_paper_response
+
+        result = search_arxiv_multi(["privacy", "the data of a user"])
+
+        assert [p["arxiv_id"] for p in result["privacy"]] == ["2301.00002v1"]
+        assert result["the data of a user"] == []
+
+    def test_multi_empty_queries_raises(self):
+        """Test that an empty query list raises ValueError."""
         with pytest.raises(ValueError) as exc_info:
-            search_arxiv("test", sort_order="invalid")
-        
-        assert "sort_order must be" in str(exc_info.value)
+            search_arxiv_multi(["", "  "])
 
-    def test_search_timeout_error(self, mock_httpx_client):
-        """Test that timeout raises ArxivAPIError."""
-        mock_httpx_client.get.side_effect = httpx.TimeoutException("Timeout")
-        
-        with pytest.raises(ArxivAPIError) as exc_info:
-            search_arxiv("test")
-        
-        assert "Request timed out" in str(exc_info.value)
+        assert "queries cannot be empty" in str(exc_info.value)
+
+
+class TestResponseCache:
+    """Tests for the on-disk arXiv response cache."""
 
-    def test_search_http_error(self, mock_httpx_client):
-        """Test that HTTP error raises ArxivAPIError."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_httpx_client.get.side_effect = httpx.HTTPStatusError(
-            "Server Error",
-            request=Mock(),
-            response=mock_response
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, monkeypatch, tmp_path):
+        """Enable the cache in a temp dir and skip rate-limit sleeps."""
+        monkeypatch.setenv("ARXIV_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(arxiv_api, "_wait_for_rate_limit", lambda: None)
+        return tmp_path
+
+    def test_fresh_entry_skips_request(self, arxiv_route):
+        """Test that a repeated query is served from disk without an HTTP call."""
+        arxiv_route.return_value = _response(SAMPLE_ARXIV_XML)
+
+        first = search_arxiv("machine learning")
+        second = search_arxiv("machine learning")
+
+        assert first == second
+        assert arxiv_route.call_count == 1
+
+    def test_stale_entry_revalidated_with_etag(self, arxiv_route, monkeypatch):
+        """Test that a stale entry is revalidated and reused on 304."""
+        monkeypatch.setattr(arxiv_api, "CACHE_TTL_RELEVANCE", 0.0)
+        arxiv_route.side_effect = [
+            httpx.Response(200, content=SAMPLE_ARXIV_XML.encode(), headers={"ETag": '"abc"'}),
+            httpx.Response(304),
+        ]
+
+        search_arxiv("machine learning")
+        result = search_arxiv("machine learning")
+
+        assert result[0]["arxiv_id"] == "2301.12345v1"
+        headers = arxiv_route.calls.last.request.headers
+        assert headers["If-None-Match"] == '"abc"'
+        assert "If-Modified-Since" not in headers
+
+
+    def test_entry_is_one_file_without_temp_leftovers(self, arxiv_route, cache_dir):
+        """Test that metadata and body are stored together and temp files are renamed."""
+        arxiv_route.return_value = httpx.Response(
+            200, content=SAMPLE_ARXIV_XML.encode(), headers={"ETag": '"abc"'}
         )
-        
-        with pytest.raises(ArxivAPIError) as exc_info:
-            search_arxiv("test")
-        
-        assert "HTTP error" in str(exc_info.value)
 
-    def test_search_network_error(self, mock_httpx_client):
-        """Test that network error raises ArxivAPIError."""
-        mock_httpx_client.get.side_effect = httpx.RequestError("Network error")
-        
-        with pytest.raises(ArxivAPIError) as exc_info:
-            search_arxiv("test")
-        
-        assert "Network error" in str(exc_info.value)
+        search_arxiv("machine learning")
 
-    def test_search_strips_whitespace(self, mock_httpx_client):
-        """Test that query whitespace is stripped."""
-        mock_response = Mock()
-        mock_response.text = EMPTY_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
-        
-        search_arxiv("  machine learning  ")
-        
-        call_args = mock_httpx_client.get.call_args
-        assert call_args.kwargs["params"]["search_query"] == "all:machine learning"
+        (entry,) = cache_dir.iterdir()
+        assert entry.suffix == ".feed"
+        cached = arxiv_api._load_cached_feed(str(entry))
+        assert cached["etag"] == '"abc"'
+        assert cached["content"] == SAMPLE_ARXIV_XML.encode()
 
 
 class TestSearchArxivByCategory:
     """Tests for search_arxiv_by_category function."""
 
-    def test_search_by_category_success(self, mock_httpx_client):
+    def test_search_by_category_success(self, arxiv_route, sample_response):
         """Test successful category search."""
-        mock_response = Mock()
-        mock_response.text = SAMPLE_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = sample_response
         
         result = search_arxiv_by_category("cs.LG")
         
         assert len(result) == 1
-        mock_httpx_client.get.assert_called_once()
+        assert arxiv_route.call_count == 1
 
-    def test_search_by_category_with_query(self, mock_httpx_client):
+    def test_search_by_category_with_query(self, arxiv_route, empty_response):
         """Test category search with additional query."""
-        mock_response = Mock()
-        mock_response.text = EMPTY_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = empty_response
         
         search_arxiv_by_category("cs.AI", query="transformers")
         
-        call_args = mock_httpx_client.get.call_args
-        assert "cat:cs.AI" in call_args.kwargs["params"]["search_query"]
-        assert "all:transformers" in call_args.kwargs["params"]["search_query"]
+        search_query = arxiv_route.calls.last.request.url.params["search_query"]
+        assert "cat:cs.AI" in search_query
+        assert "all:transformers" in search_query
 
     def test_search_by_category_empty_raises(self):
         """Test that empty category raises ValueError."""
@@ -196,12 +347,16 @@ class TestSearchArxivByCategory:
 class TestGetPaperById:
     """Tests for get_paper_by_id function."""
 
-    def test_get_paper_success(self, mock_httpx_client):
+    @pytest.fixture(autouse=True)
+    def clear_paper_cache(self):
+        """Start every test with an empty paper cache."""
+        arxiv_api._get_paper_by_id_cached.cache_clear()
+        yield
+        arxiv_api._get_paper_by_id_cached.cache_clear()
+
+    def test_get_paper_success(self, arxiv_route, sample_response):
         """Test successful paper retrieval."""
-        mock_response = Mock()
-        mock_response.text = SAMPLE_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = sample_response
         
         result = get_paper_by_id("2301.12345v1")
         
@@ -209,17 +364,36 @@ class TestGetPaperById:
         assert result["arxiv_id"] == "2301.12345v1"
         assert result["title"] == "Test Paper About Machine Learning"
 
-    def test_get_paper_not_found(self, mock_httpx_client):
+    def test_get_paper_cached(self, arxiv_route, sample_response):
+        """Test that repeated lookups reuse the cached paper."""
+        arxiv_route.return_value = sample_response
+
+        first = get_paper_by_id("2301.12345v1")
+        first["title"] = "mutated"
+        second = get_paper_by_id(" 2301.12345v1 ")
+
+        assert arxiv_route.call_count == 1
+        assert second["title"] == "Test Paper About Machine Learning"
+
+    def test_get_paper_not_found(self, arxiv_route, empty_response):
         """Test paper not found returns None."""
-        mock_response = Mock()
-        mock_response.text = EMPTY_ARXIV_XML
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        arxiv_route.return_value = empty_response
         
         result = get_paper_by_id("nonexistent")
         
         assert result is None
 
+    def test_get_paper_not_found_is_not_cached(
+        self, arxiv_route, empty_response, sample_response, monkeypatch
+    ):
+        """Test that a miss is retried so a newly indexed paper is found."""
+        monkeypatch.setattr(arxiv_api, "_wait_for_rate_limit", lambda: None)
+        arxiv_route.side_effect = [empty_response, sample_response]
+
+        assert get_paper_by_id("2301.12345v1") is None
+        assert get_paper_by_id("2301.12345v1")["arxiv_id"] == "2301.12345v1"
+        assert arxiv_route.call_count == 2
+
     def test_get_paper_empty_id_raises(self):
         """Test that empty arxiv_id raises ValueError."""
         with pytest.raises(ValueError) as exc_info:
@@ -228,6 +402,50 @@ class TestGetPaperById:
         assert "arxiv_id cannot be empty" in str(exc_info.value)
 
 
+class TestRateLimit:
+    """Tests for the request rate limiter."""
+
+    def test_consecutive_callers_reserve_sequential_slots(self, monkeypatch):
+        """Test that each caller waits for its own slot after the previous one."""
+        monkeypatch.setattr(arxiv_api, "_next_allowed_time", 0.0)
+        monkeypatch.setattr(arxiv_api.time, "monotonic", lambda: 100.0)
+        sleeps = []
+        monkeypatch.setattr(arxiv_api.time, "sleep", sleeps.append)
+
+        for _ in range(3):
+            arxiv_api._wait_for_rate_limit()
+
+        delay = arxiv_api.RATE_LIMIT_DELAY
+        assert sleeps == [delay, 2 * delay]
+        assert arxiv_api._next_allowed_time == 100.0 + 3 * delay
+
+
+    @pytest.mark.parametrize("pick", [min, max])
+    def test_retry_backoff_is_jittered_exponential(self, monkeypatch, pick):
+        """Test that retry backoff doubles per attempt within the jitter band."""
+        monkeypatch.setattr(arxiv_api.random, "uniform", lambda low, high: pick(low, high))
+        factor = pick(1.0, 1.0 + arxiv_api.RETRY_JITTER)
+        base = arxiv_api.RETRY_BACKOFF_BASE * factor
+
+        assert [arxiv_api._retry_backoff(a) for a in range(3)] == [base, 2 * base, 4 * base]
+
+
+class TestSharedClient:
+    """Tests for the shared httpx client."""
+
+    def test_client_is_reused_until_closed(self, monkeypatch):
+        """Test that one client is shared and closing it allows a fresh one."""
+        monkeypatch.setattr(arxiv_api, "_http_client", None)
+        monkeypatch.setattr(arxiv_api.atexit, "register", Mock())
+
+        client = arxiv_api._get_client()
+        assert arxiv_api._get_client() is client
+
+        arxiv_api._close_client()
+        assert client.is_closed
+        assert arxiv_api._http_client is None
+
+
 class TestConstants:
     """Tests for module constants."""
 
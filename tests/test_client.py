@@ -1,27 +1,50 @@
 """Tests for FastAPI client endpoints."""
 
+import asyncio
+
 import pytest
-from unittest.mock import patch, Mock, MagicMock
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from pydantic import ValidationError
 
-# We need to mock the client before importing the app
-with patch("arxiv_research_agent.client.DurableTaskSchedulerClient"):
-    from arxiv_research_agent.client import app, AgentStartRequest
+# The scheduler client is created lazily by get_client, so importing is side-effect free
+from arxiv_research_agent import client as client_module
+from arxiv_research_agent.client import (
+    app, AgentStartRequest, start_agent, terminate_agent, wait_for_agent
+)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_client():
-    """Create a test client."""
+    """Create a test client shared by the module (lifespan is not run)."""
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_status_cache():
+    """Start every test with an empty status cache and no shared waits."""
+    from arxiv_research_agent.client import _pending_waits, _terminal_status_cache
+    _terminal_status_cache.clear()
+    _pending_waits.clear()
+    yield
+    _terminal_status_cache.clear()
+    _pending_waits.clear()
+
+
+@pytest.fixture(scope="module")
+def shared_durable_client():
+    """Patch get_client once per module with a single mock DurableTask client."""
+    with patch.object(client_module, "get_client") as mock_get:
+        mock_get.return_value = MagicMock()
+        yield mock_get.return_value
+
+
 @pytest.fixture
-def mock_durable_client():
-    """Mock the DurableTask client."""
-    with patch("arxiv_research_agent.client.get_client") as mock_get:
-        mock_client = MagicMock()
-        mock_get.return_value = mock_client
-        yield mock_client
+def mock_durable_client(shared_durable_client):
+    """Mock the DurableTask client, reset for each test."""
+    shared_durable_client.reset_mock(return_value=True, side_effect=True)
+    return shared_durable_client
 
 
 class TestHealthEndpoint:
@@ -65,24 +88,15 @@ class TestStartAgentEndpoint:
         call_args = mock_durable_client.schedule_new_orchestration.call_args
         assert call_args.kwargs["input"]["max_iterations"] == 3
 
-    def test_start_agent_empty_topic(self, test_client, mock_durable_client):
-        """Test starting an agent with empty topic fails."""
-        response = test_client.post(
-            "/agents",
-            json={"topic": ""}
-        )
-        
-        assert response.status_code == 400
-        assert "Topic cannot be empty" in response.json()["detail"]
-
-    def test_start_agent_whitespace_topic(self, test_client, mock_durable_client):
-        """Test starting an agent with whitespace topic fails."""
-        response = test_client.post(
-            "/agents",
-            json={"topic": "   "}
-        )
+    @pytest.mark.parametrize("topic", ["", "   "])
+    def test_start_agent_blank_topic(self, topic, mock_durable_client):
+        """Test starting an agent with an empty or whitespace topic fails."""
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(start_agent(AgentStartRequest(topic=topic)))
         
-        assert response.status_code == 400
+        assert exc_info.value.status_code == 400
+        assert "Topic cannot be empty" in exc_info.value.detail
+        mock_durable_client.schedule_new_orchestration.assert_not_called()
 
     def test_start_agent_error(self, test_client, mock_durable_client):
         """Test starting an agent handles errors."""
@@ -139,7 +153,7 @@ class TestGetAgentStatusEndpoint:
         mock_state.created_at = None
         mock_durable_client.get_orchestration_state.return_value = mock_state
         
-        response = test_client.get("/agents/instance-123")
+        response = test_client.get("/agents/instance-123?include_report=true")
         
         assert response.status_code == 200
         data = response.json()
@@ -147,6 +161,99 @@ class TestGetAgentStatusEndpoint:
         assert data["report"] == "Final literature review"
         assert data["iterations"] == 3
 
+    def test_get_status_completed_without_report(self, test_client, mock_durable_client):
+        """Test that the output is not parsed unless include_report is set."""
+        from durabletask import client as durable_client
+        
+        mock_state = Mock()
+        mock_state.runtime_status = durable_client.OrchestrationStatus.COMPLETED
+        mock_state.serialized_input = '{"topic": "neural networks"}'
+        mock_state.serialized_output = "not json"
+        mock_state.created_at = None
+        mock_durable_client.get_orchestration_state.return_value = mock_state
+        
+        response = test_client.get("/agents/instance-123")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "COMPLETED"
+        assert data["topic"] == "neural networks"
+        assert data["report"] is None
+        assert data["iterations"] is None
+
+    def test_get_status_terminal_is_cached(self, test_client, mock_durable_client):
+        """Test that a finished agent's status is served without refetching."""
+        from durabletask import client as durable_client
+        
+        mock_state = Mock()
+        mock_state.runtime_status = durable_client.OrchestrationStatus.COMPLETED
+        mock_state.serialized_input = '{"topic": "neural networks"}'
+        mock_state.serialized_output = '{"topic": "neural networks", "iterations": 3, "report": "Report"}'
+        mock_state.created_at = None
+        mock_durable_client.get_orchestration_state.return_value = mock_state
+        
+        first = test_client.get("/agents/instance-123")
+        second = test_client.get("/agents/instance-123")
+        
+        assert first.json() == second.json()
+        mock_durable_client.get_orchestration_state.assert_called_once()
+
+    def test_get_status_running_is_not_cached(self, test_client, mock_durable_client):
+        """Test that in-progress statuses are always refetched."""
+        from durabletask import client as durable_client
+        
+        mock_state = Mock()
+        mock_state.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        mock_state.serialized_input = '{"topic": "neural networks"}'
+        mock_state.serialized_output = None
+        mock_state.created_at = None
+        mock_durable_client.get_orchestration_state.return_value = mock_state
+        
+        test_client.get("/agents/instance-123")
+        test_client.get("/agents/instance-123")
+        
+        assert mock_durable_client.get_orchestration_state.call_count == 2
+
+    def test_get_status_not_modified(self, test_client, mock_durable_client):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        from durabletask import client as durable_client
+        
+        mock_state = Mock()
+        mock_state.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        mock_state.last_updated_at = "2024-01-01T00:00:00"
+        mock_state.serialized_input = '{"topic": "neural networks"}'
+        mock_state.serialized_output = None
+        mock_state.created_at = None
+        mock_durable_client.get_orchestration_state.return_value = mock_state
+        
+        first = test_client.get("/agents/instance-123")
+        etag = first.headers["ETag"]
+        second = test_client.get("/agents/instance-123", headers={"If-None-Match": etag})
+        
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+
+    def test_get_status_modified_returns_body(self, test_client, mock_durable_client):
+        """Test that a changed status is returned in full with a new ETag."""
+        from durabletask import client as durable_client
+        
+        mock_state = Mock()
+        mock_state.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        mock_state.last_updated_at = "2024-01-01T00:00:00"
+        mock_state.serialized_input = '{"topic": "neural networks"}'
+        mock_state.serialized_output = None
+        mock_state.created_at = None
+        mock_durable_client.get_orchestration_state.return_value = mock_state
+        
+        etag = test_client.get("/agents/instance-123").headers["ETag"]
+        mock_state.last_updated_at = "2024-01-01T00:01:00"
+        response = test_client.get("/agents/instance-123", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "RUNNING"
+        assert response.headers["ETag"] != etag
+
     def test_get_status_not_found(self, test_client, mock_durable_client):
         """Test getting status of non-existent agent."""
         mock_durable_client.get_orchestration_state.return_value = None
@@ -185,6 +292,90 @@ class TestWaitForAgentEndpoint:
         
         assert response.status_code == 408
 
+    def test_concurrent_waits_share_one_upstream_wait(self, mock_durable_client):
+        """Test concurrent waits on one instance make a single scheduler call."""
+        import time
+        from durabletask import client as durable_client
+        
+        completed = Mock()
+        completed.runtime_status = durable_client.OrchestrationStatus.COMPLETED
+        completed.serialized_output = '{"topic": "t", "iterations": 1, "report": "R", "findings_count": 1}'
+        
+        def slow_wait(*args, **kwargs):
+            time.sleep(0.1)
+            return completed
+        
+        mock_durable_client.wait_for_orchestration_completion.side_effect = slow_wait
+        
+        async def run():
+            return await asyncio.gather(
+                wait_for_agent("instance-123"), wait_for_agent("instance-123")
+            )
+        
+        first, second = asyncio.run(run())
+        
+        assert first == second
+        assert first.report == "R"
+        mock_durable_client.wait_for_orchestration_completion.assert_called_once()
+        assert not client_module._pending_waits
+
+    def test_joined_wait_outlives_shorter_first_wait(self, mock_durable_client):
+        """Test a joiner with a longer timeout keeps waiting after the first caller times out."""
+        from durabletask import client as durable_client
+        
+        running = Mock()
+        running.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        completed = Mock()
+        completed.runtime_status = durable_client.OrchestrationStatus.COMPLETED
+        completed.serialized_output = '{"topic": "t", "iterations": 1, "report": "R", "findings_count": 1}'
+        mock_durable_client.wait_for_orchestration_completion.side_effect = [running, completed]
+        mock_durable_client.get_orchestration_state.return_value = running
+        
+        async def run():
+            return await asyncio.gather(
+                wait_for_agent("instance-123", timeout=0),
+                wait_for_agent("instance-123", timeout=60),
+                return_exceptions=True,
+            )
+        
+        first, second = asyncio.run(run())
+        
+        assert isinstance(first, HTTPException) and first.status_code == 408
+        assert second.report == "R"
+        assert mock_durable_client.wait_for_orchestration_completion.call_count == 2
+        assert not client_module._pending_waits
+
+    def test_wait_polls_after_long_poll_times_out(self, test_client, mock_durable_client):
+        """Test that the endpoint polls with backoff after the initial wait times out."""
+        from durabletask import client as durable_client
+        
+        running = Mock()
+        running.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        completed = Mock()
+        completed.runtime_status = durable_client.OrchestrationStatus.COMPLETED
+        completed.serialized_output = '{"topic": "t", "iterations": 1, "report": "R", "findings_count": 1}'
+        mock_durable_client.wait_for_orchestration_completion.side_effect = TimeoutError()
+        mock_durable_client.get_orchestration_state.side_effect = [running, running, completed]
+        
+        with patch("arxiv_research_agent.client.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            response = test_client.get("/agents/instance-123/wait")
+        
+        assert response.status_code == 200
+        assert response.json()["report"] == "R"
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2.0, 3.0]
+
+    def test_wait_times_out_while_running(self, test_client, mock_durable_client):
+        """Test that a still-running agent returns 408 once the timeout elapses."""
+        from durabletask import client as durable_client
+        
+        running = Mock()
+        running.runtime_status = durable_client.OrchestrationStatus.RUNNING
+        mock_durable_client.wait_for_orchestration_completion.return_value = running
+        
+        response = test_client.get("/agents/instance-123/wait?timeout=0")
+        
+        assert response.status_code == 408
+
     def test_wait_failed(self, test_client, mock_durable_client):
         """Test waiting for failed agent."""
         from durabletask import client as durable_client
@@ -201,43 +392,115 @@ class TestWaitForAgentEndpoint:
 class TestTerminateAgentEndpoint:
     """Tests for DELETE /agents/{instance_id} endpoint."""
 
-    def test_terminate_success(self, test_client, mock_durable_client):
+    def test_terminate_success(self, mock_durable_client):
         """Test terminating an agent successfully."""
-        response = test_client.delete("/agents/instance-123")
+        data = asyncio.run(_terminate_and_drain("instance-123"))
         
-        assert response.status_code == 200
-        data = response.json()
         assert data["ok"] is True
-        mock_durable_client.terminate_orchestration.assert_called_once()
+        mock_durable_client.terminate_orchestration.assert_called_once_with(
+            "instance-123", output="Terminated by user"
+        )
 
-    def test_terminate_error(self, test_client, mock_durable_client):
-        """Test terminating an agent handles errors."""
+    def test_terminate_returns_before_call_completes(self, mock_durable_client):
+        """Test the response does not wait for the terminate RPC."""
+        async def run():
+            response = await terminate_agent("instance-123")
+            pending = set(client_module._background_tasks)
+            await asyncio.gather(*pending)
+            return response, pending
+        
+        response, pending = asyncio.run(run())
+        
+        assert response["ok"] is True
+        assert len(pending) == 1
+        assert not client_module._background_tasks
+
+    def test_terminate_error(self, mock_durable_client, caplog):
+        """Test a failed terminate is logged rather than raised."""
         mock_durable_client.terminate_orchestration.side_effect = Exception("Error")
         
-        response = test_client.delete("/agents/instance-123")
+        data = asyncio.run(_terminate_and_drain("instance-123"))
+        
+        assert data["ok"] is True
+        assert "Background scheduler call failed: Error" in caplog.text
+
+    def test_terminate_client_error(self, test_client):
+        """Test terminate returns 500 when the client cannot be created."""
+        with patch("arxiv_research_agent.client.get_client", side_effect=Exception("Error")):
+            response = test_client.delete("/agents/instance-123")
         
         assert response.status_code == 500
 
 
+async def _terminate_and_drain(instance_id):
+    """Call terminate_agent and wait for its background call to finish."""
+    response = await terminate_agent(instance_id)
+    await asyncio.gather(*client_module._background_tasks, return_exceptions=True)
+    return response
+
+
 class TestAgentStartRequestValidation:
     """Tests for AgentStartRequest validation."""
 
-    def test_validated_max_iterations_normal(self):
-        """Test validated_max_iterations with normal value."""
+    def test_max_iterations_default(self):
+        """Test max_iterations defaults to 3."""
+        request = AgentStartRequest(topic="test")
+        assert request.max_iterations == 3
+
+    def test_max_iterations_normal(self):
+        """Test max_iterations accepts values within bounds."""
         request = AgentStartRequest(topic="test", max_iterations=5)
-        assert request.validated_max_iterations == 5
-
-    def test_validated_max_iterations_too_low(self):
-        """Test validated_max_iterations clamps low values."""
-        request = AgentStartRequest(topic="test", max_iterations=0)
-        assert request.validated_max_iterations == 1
-
-    def test_validated_max_iterations_too_high(self):
-        """Test validated_max_iterations clamps high values."""
-        request = AgentStartRequest(topic="test", max_iterations=20)
-        assert request.validated_max_iterations == 10
-
-    def test_validated_max_iterations_negative(self):
-        """Test validated_max_iterations handles negative values."""
-        request = AgentStartRequest(topic="test", max_iterations=-5)
-        assert request.validated_max_iterations == 1
+        assert request.max_iterations == 5
+
+    @pytest.mark.parametrize("value", [0, -5, 11, 20])
+    def test_max_iterations_out_of_range(self, value):
+        """Test max_iterations rejects values outside 1-10."""
+        with pytest.raises(ValidationError):
+            AgentStartRequest(topic="test", max_iterations=value)
+
+    def test_start_agent_rejects_out_of_range(self, test_client, mock_durable_client):
+        """Test the endpoint returns 422 for out-of-range max_iterations."""
+        response = test_client.post(
+            "/agents",
+            json={"topic": "test", "max_iterations": 20}
+        )
+        
+        assert response.status_code == 422
+        mock_durable_client.schedule_new_orchestration.assert_not_called()
+
+
+class TestSchedulerThreadPool:
+    """Tests for the dedicated scheduler thread pool."""
+
+    def test_lifespan_runs_scheduler_calls_on_pool(self, mock_durable_client):
+        """Test scheduler calls run on the pool created at startup."""
+        import threading
+        
+        mock_durable_client.schedule_new_orchestration.side_effect = (
+            lambda *args, **kwargs: threading.current_thread().name
+        )
+        
+        with TestClient(app) as client:
+            response = client.post("/agents", json={"topic": "neural networks"})
+        
+        assert response.status_code == 200
+        assert response.json()["instance_id"].startswith("dts")
+        assert client_module._scheduler_executor is None
+
+
+class TestGetCredential:
+    """Tests for get_credential."""
+
+    def test_failed_credential_is_retried(self, monkeypatch):
+        """Test a credential failure is not cached and success is reused."""
+        credential = Mock()
+        chained = Mock(side_effect=[RuntimeError("IMDS unavailable"), credential])
+        monkeypatch.setattr(client_module, "_SECURE", True)
+        monkeypatch.setattr(client_module, "_CLIENT_ID", None)
+        monkeypatch.setattr(client_module, "_credential", None)
+        monkeypatch.setattr(client_module, "ChainedTokenCredential", chained)
+        
+        assert client_module.get_credential() is None
+        assert client_module.get_credential() is credential
+        assert client_module.get_credential() is credential
+        assert chained.call_count == 2
@@ -2,9 +2,10 @@
 
 import pytest
 import json
-from unittest.mock import patch, Mock
+from unittest.mock import ANY, MagicMock, patch, Mock
 
 from arxiv_research_agent.llm import (
+    RateLimiter,
     call_llm,
     parse_json_response,
     DEFAULT_MODEL,
@@ -28,6 +29,17 @@ class TestParseJsonResponse:
         result = parse_json_response(response)
         assert result == ["item1", "item2", "item3"]
 
+    def test_parse_already_parsed(self):
+        """Test that an already-parsed value is returned as is."""
+        parsed = {"key": "value"}
+        assert parse_json_response(parsed) is parsed
+
+    def test_parse_fenced_json(self):
+        """Test parsing JSON wrapped in a Markdown code fence."""
+        response = 'Here you go:\n```json\n{"key": "value"}\n```'
+        result = parse_json_response(response)
+        assert result == {"key": "value"}
+
     def test_parse_invalid_json_raises(self):
         """Test that invalid JSON raises exception."""
         response = 'not valid json'
@@ -70,6 +82,32 @@ class TestCallLlm:
         call_args = mock_openai_client.responses.create.call_args
         assert call_args.kwargs["model"] == DEFAULT_MODEL
 
+    def test_call_llm_flattens_messages(self, mock_openai_client):
+        """Test that messages are joined into a single role-prefixed input."""
+        messages = [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hello"},
+            {"role": "tool", "content": "42"},
+        ]
+        
+        call_llm(messages)
+        
+        call_args = mock_openai_client.responses.create.call_args
+        assert call_args.kwargs["input"] == "SYSTEM: Be brief.\nUSER: Hello\nTOOL: 42"
+
+    def test_call_llm_prompt_cache_key_follows_system_prompt(self, mock_openai_client):
+        """Test calls sharing a system prompt share a prompt cache key."""
+        call_llm([{"role": "system", "content": "Rubric"}, {"role": "user", "content": "A"}])
+        call_llm([{"role": "system", "content": "Rubric"}, {"role": "user", "content": "B"}])
+        call_llm([{"role": "system", "content": "Other"}, {"role": "user", "content": "A"}])
+        call_llm([{"role": "user", "content": "No system prompt"}])
+        
+        calls = mock_openai_client.responses.create.call_args_list
+        keys = [c.kwargs.get("prompt_cache_key") for c in calls]
+        assert keys[0] == keys[1]
+        assert keys[0] != keys[2]
+        assert keys[3] is None
+
     def test_call_llm_api_error(self, mock_openai_client):
         """Test LLM call handles API errors."""
         mock_openai_client.responses.create.side_effect = Exception("API Error")
@@ -81,15 +119,109 @@ class TestCallLlm:
         
         assert "LLM API call failed" in str(exc_info.value)
 
-    def test_call_llm_no_client(self):
+    def test_call_llm_reads_single_text_part(self, mock_openai_client):
+        """Test that a lone text part is read without output_text."""
+        response = mock_openai_client.responses.create.return_value
+        response.output = [
+            Mock(type="reasoning"),
+            Mock(type="message", content=[Mock(type="output_text", text='{"a": 1}')]),
+        ]
+        response.output_text = "unused"
+        
+        result = call_llm([{"role": "user", "content": "Hello"}])
+        
+        assert result == '{"a": 1}'
+
+    def test_call_llm_multi_part_falls_back_to_output_text(self, mock_openai_client):
+        """Test that multi-part messages use the aggregated output_text."""
+        response = mock_openai_client.responses.create.return_value
+        response.output = [
+            Mock(type="message", content=[
+                Mock(type="output_text", text='{"a"'),
+                Mock(type="output_text", text=': 1}'),
+            ]),
+        ]
+        response.output_text = '{"a": 1}'
+        
+        result = call_llm([{"role": "user", "content": "Hello"}])
+        
+        assert result == '{"a": 1}'
+
+    def test_call_llm_reuses_identical_prompt(self, mock_openai_client):
+        """Test that an identical low-temperature prompt is served from cache."""
+        messages = [{"role": "user", "content": "Hello"}]
+        
+        first = call_llm(messages)
+        second = call_llm(messages)
+        
+        assert first == second
+        mock_openai_client.responses.create.assert_called_once()
+
+    def test_call_llm_high_temperature_not_cached(self, mock_openai_client):
+        """Test that high-temperature calls always reach the API."""
+        messages = [{"role": "user", "content": "Hello"}]
+        
+        call_llm(messages, temperature=0.9)
+        call_llm(messages, temperature=0.9)
+        
+        assert mock_openai_client.responses.create.call_count == 2
+
+    def test_call_llm_semantic_cache_hit(self, mock_openai_client, monkeypatch):
+        """Test that a semantic cache hit skips the API call."""
+        cache = Mock()
+        cache.lookup.return_value = "cached"
+        messages = [{"role": "user", "content": "Hello"}]
+
+        monkeypatch.setattr("arxiv_research_agent.llm.semantic_cache", cache)
+        result = call_llm(messages)
+
+        assert result == "cached"
+        mock_openai_client.responses.create.assert_not_called()
+
+    def test_call_llm_semantic_cache_stores_response(self, mock_openai_client, monkeypatch):
+        """Test that a semantic cache miss stores the API response."""
+        cache = Mock()
+        cache.lookup.return_value = None
+        messages = [{"role": "user", "content": "Hello"}]
+
+        monkeypatch.setattr("arxiv_research_agent.llm.semantic_cache", cache)
+        call_llm(messages)
+
+        cache.store.assert_called_once_with(ANY, "Hello", '{"test": "response"}')
+
+    def test_call_llm_semantic_cache_disabled_per_call(self, mock_openai_client, monkeypatch):
+        """Test that use_semantic_cache=False bypasses the cache."""
+        cache = Mock()
+        messages = [{"role": "user", "content": "Hello"}]
+
+        monkeypatch.setattr("arxiv_research_agent.llm.semantic_cache", cache)
+        call_llm(messages, use_semantic_cache=False)
+
+        cache.lookup.assert_not_called()
+        cache.store.assert_not_called()
+
+    def test_call_llm_holds_concurrency_slot(self, mock_openai_client, monkeypatch):
+        """Test that the API request is made while holding a concurrency slot."""
+        semaphore = MagicMock()
+        semaphore.__enter__.side_effect = lambda: mock_openai_client.responses.create.assert_not_called()
+        messages = [{"role": "user", "content": "Hello"}]
+
+        monkeypatch.setattr("arxiv_research_agent.llm._llm_semaphore", semaphore)
+        call_llm(messages)
+
+        semaphore.__enter__.assert_called_once()
+        semaphore.__exit__.assert_called_once()
+        mock_openai_client.responses.create.assert_called_once()
+
+    def test_call_llm_no_client(self, monkeypatch):
         """Test LLM call raises error when client is None."""
-        with patch("arxiv_research_agent.llm.client", None):
-            messages = [{"role": "user", "content": "Hello"}]
-            
-            with pytest.raises(RuntimeError) as exc_info:
-                call_llm(messages)
-            
-            assert "OpenAI client not initialized" in str(exc_info.value)
+        monkeypatch.setattr("arxiv_research_agent.llm.client", None)
+        messages = [{"role": "user", "content": "Hello"}]
+
+        with pytest.raises(RuntimeError) as exc_info:
+            call_llm(messages)
+
+        assert "OpenAI client not initialized" in str(exc_info.value)
 
 
 class TestDefaultConstants:
@@ -108,3 +240,59 @@ class TestDefaultConstants:
     def test_default_max_tokens(self):
         """Test default max tokens constant."""
         assert DEFAULT_MAX_TOKENS == 2000
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_full_bucket_does_not_wait(self):
+        """Test calls within the budget go through immediately."""
+        limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1000)
+        
+        with patch("arxiv_research_agent.llm.time.sleep") as mock_sleep:
+            limiter.acquire(400)
+            limiter.acquire(400)
+        
+        mock_sleep.assert_not_called()
+
+    def test_waits_for_request_capacity(self):
+        """Test a call past the request budget waits for the bucket to refill."""
+        limiter = RateLimiter(requests_per_minute=1)
+        clock = [100.0]
+        limiter._last_refill = clock[0]
+        
+        def advance(seconds):
+            clock[0] += seconds
+        
+        with patch("arxiv_research_agent.llm.time.monotonic", side_effect=lambda: clock[0]), \
+                patch("arxiv_research_agent.llm.time.sleep", side_effect=advance) as mock_sleep:
+            limiter.acquire(0)
+            limiter.acquire(0)
+        
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [pytest.approx(60.0)]
+
+    def test_waits_for_token_capacity(self):
+        """Test a call past the token budget waits in proportion to the shortfall."""
+        limiter = RateLimiter(tokens_per_minute=600)
+        clock = [100.0]
+        limiter._last_refill = clock[0]
+        
+        def advance(seconds):
+            clock[0] += seconds
+        
+        with patch("arxiv_research_agent.llm.time.monotonic", side_effect=lambda: clock[0]), \
+                patch("arxiv_research_agent.llm.time.sleep", side_effect=advance) as mock_sleep:
+            limiter.acquire(500)
+            limiter.acquire(200)
+        
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [pytest.approx(10.0)]
+
+    def test_call_llm_acquires_from_limiter(self, mock_openai_client, monkeypatch):
+        """Test call_llm reserves the estimated tokens before calling the API."""
+        limiter = Mock()
+        messages = [{"role": "user", "content": "x" * 400}]
+        
+        monkeypatch.setattr("arxiv_research_agent.llm.rate_limiter", limiter)
+        call_llm(messages, max_tokens=100)
+        
+        limiter.acquire.assert_called_once_with(len("USER: ") // 4 + 100 + 100)
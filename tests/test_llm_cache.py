@@ -0,0 +1,95 @@
+"""Tests for LLM response caches."""
+
+from unittest.mock import patch
+
+import pytest
+
+from arxiv_research_agent.llm_cache import LLMCache, SemanticCache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _fake_encoder(text):
+    """Embed text as a bag of known words so similarity is predictable."""
+    vocab = ["transformer", "attention", "graph", "neural", "network"]
+    words = text.lower().split()
+    return np.array([float(word in words) for word in vocab])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Semantic cache backed by a temporary database."""
+    return SemanticCache(str(tmp_path / "cache.db"), threshold=0.9, encoder=_fake_encoder)
+
+
+class TestLLMCache:
+    """Tests for LLMCache."""
+
+    def test_get_returns_stored_response(self):
+        """Test a stored response is returned and counted as a hit."""
+        cache = LLMCache()
+        cache.set("key", "response")
+        
+        assert cache.get("key") == "response"
+        assert cache.get("other") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = LLMCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are dropped."""
+        cache = LLMCache(ttl=10)
+        with patch("arxiv_research_agent.llm_cache.time.monotonic", return_value=100.0):
+            cache.set("key", "response")
+        with patch("arxiv_research_agent.llm_cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_lookup_empty_cache_misses(self, cache):
+        """Test lookup on an empty cache returns None."""
+        assert cache.lookup("ns", "transformer attention") is None
+
+    def test_similar_prompt_hits(self, cache):
+        """Test a reworded prompt with the same meaning reuses the response."""
+        cache.store("ns", "transformer attention", "cached response")
+
+        assert cache.lookup("ns", "attention in transformer") == "cached response"
+
+    def test_dissimilar_prompt_misses(self, cache):
+        """Test a prompt below the similarity threshold misses."""
+        cache.store("ns", "transformer attention", "cached response")
+
+        assert cache.lookup("ns", "graph neural network") is None
+
+    def test_namespaces_are_isolated(self, cache):
+        """Test entries are only matched within their own namespace."""
+        cache.store("analyze", "transformer attention", "cached response")
+
+        assert cache.lookup("synthesize", "transformer attention") is None
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test entries are reloaded from the database."""
+        path = str(tmp_path / "cache.db")
+        SemanticCache(path, encoder=_fake_encoder).store("ns", "graph network", "persisted")
+
+        reopened = SemanticCache(path, encoder=_fake_encoder)
+
+        assert reopened.lookup("ns", "graph network") == "persisted"
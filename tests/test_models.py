@@ -1,5 +1,7 @@
 """Tests for data models."""
 
+import json
+
 import pytest
 from arxiv_research_agent.models import (
     AgentStatusEnum,
@@ -10,6 +12,7 @@ from arxiv_research_agent.models import (
     AgentStartRequest,
     ResearchTopicInput,
     ResearchWorkflowInput,
+    serialize_evaluation,
 )
 
 
@@ -52,6 +55,55 @@ class TestPaperReference:
         assert paper.primary_category == "cs.LG"
         assert len(paper.categories) == 2
 
+    def test_paper_reference_to_dict(self):
+        """Test PaperReference.to_dict includes every field, defaults included."""
+        paper = PaperReference(
+            arxiv_id="2301.12345v1",
+            title="Test Paper",
+            authors=["John Smith"],
+            summary="",
+            published="2023-01-15T00:00:00Z",
+            primary_category="cs.LG",
+            categories=["cs.LG"],
+            pdf_url="",
+            abs_url="",
+        )
+
+        assert paper.to_dict() == {
+            "arxiv_id": "2301.12345v1",
+            "title": "Test Paper",
+            "authors": ["John Smith"],
+            "summary": "",
+            "published": "2023-01-15T00:00:00Z",
+            "primary_category": "cs.LG",
+            "categories": ["cs.LG"],
+            "pdf_url": "",
+            "abs_url": "",
+            "comment": "",
+            "journal_ref": "",
+            "doi": "",
+        }
+
+    def test_paper_reference_is_frozen_and_slotted(self):
+        """Test that PaperReference is immutable and has no per-instance __dict__."""
+        import dataclasses
+
+        paper = PaperReference(
+            arxiv_id="2301.12345v1",
+            title="Test Paper",
+            authors=[],
+            summary="",
+            published="",
+            primary_category="cs.LG",
+            categories=[],
+            pdf_url="",
+            abs_url="",
+        )
+
+        assert not hasattr(paper, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            paper.title = "Other"
+
 
 class TestEvaluationResult:
     """Tests for EvaluationResult dataclass."""
@@ -108,6 +160,33 @@ class TestEvaluationResult:
         assert len(d["top_papers"]) == 1
         assert d["top_papers"][0]["title"] == "Test Paper"
 
+    def test_serialize_evaluation_matches_to_dict(self):
+        """Test serialize_evaluation produces the same JSON as to_dict."""
+        paper = PaperReference(
+            arxiv_id="2301.12345",
+            title="Test Paper",
+            authors=["John Smith"],
+            summary="Test summary",
+            published="2023-01-15",
+            primary_category="cs.LG",
+            categories=["cs.LG"],
+            pdf_url="https://arxiv.org/pdf/2301.12345",
+            abs_url="https://arxiv.org/abs/2301.12345",
+        )
+        result = EvaluationResult(
+            query="query",
+            insights=["insight"],
+            relevance_score=7,
+            summary="summary",
+            key_points=["point"],
+            top_papers=[paper],
+        )
+        
+        data = serialize_evaluation(result)
+        
+        assert isinstance(data, bytes)
+        assert json.loads(data) == result.to_dict()
+
 
 class TestResearchReport:
     """Tests for ResearchReport dataclass."""
@@ -1,7 +1,7 @@
 """Tests for orchestrations."""
 
 import pytest
-from unittest.mock import ANY, Mock, call
+from unittest.mock import ANY, Mock, call, patch
 
 
 class TestPaperResearchOrchestrator:
@@ -87,9 +87,166 @@ class TestPaperResearchOrchestrator:
         assert exc_info.value.value == analysis
 
 
+    def test_orchestrator_uses_prefetched_papers(self):
+        """Test orchestrator skips the search when papers are provided."""
+        from arxiv_research_agent.orchestrations import paper_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="analyze_call")
+        papers = [{"title": "paper"}]
+
+        gen = paper_research_orchestrator(
+            ctx,
+            {"main_topic": "machine learning", "query": "neural networks", "papers": papers}
+        )
+
+        assert next(gen) == "analyze_call"
+        ctx.call_activity.assert_called_once_with(
+            "analyze_papers_activity",
+            input={
+                "topic": "machine learning",
+                "query": "neural networks",
+                "papers": papers,
+            },
+            retry_policy=ANY,
+        )
+
+
+    def test_orchestrator_skips_seen_papers(self):
+        """Test papers analyzed in earlier iterations are not analyzed again."""
+        from arxiv_research_agent.orchestrations import paper_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="analyze_call")
+        papers = [{"arxiv_id": "1"}, {"arxiv_id": "2"}, {"arxiv_id": "3"}]
+
+        gen = paper_research_orchestrator(
+            ctx,
+            {"main_topic": "ml", "query": "nn", "papers": papers, "seen_ids": ["1", "3"]}
+        )
+
+        assert next(gen) == "analyze_call"
+        assert ctx.call_activity.call_args.kwargs["input"]["papers"] == [{"arxiv_id": "2"}]
+
+    def test_orchestrator_trims_new_papers_after_seen_filter(self):
+        """Test seen papers are dropped before the result is trimmed to the analysis cap."""
+        from arxiv_research_agent.activities import MAX_PAPERS_TO_ANALYZE
+        from arxiv_research_agent.orchestrations import paper_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="activity_call")
+        papers = [{"arxiv_id": str(i)} for i in range(30)]
+        seen_ids = [str(i) for i in range(10)]
+
+        with patch("arxiv_research_agent.orchestrations.task.when_all"):
+            gen = paper_research_orchestrator(
+                ctx, {"main_topic": "ml", "query": "nn", "papers": papers, "seen_ids": seen_ids}
+            )
+            next(gen)
+
+        analyzed = [p for c in ctx.call_activity.call_args_list for p in c.kwargs["input"]["papers"]]
+        assert analyzed == papers[10:10 + MAX_PAPERS_TO_ANALYZE]
+
+    def test_orchestrator_all_papers_seen(self):
+        """Test no analysis is requested when every paper was seen before."""
+        from arxiv_research_agent.orchestrations import paper_research_orchestrator
+
+        ctx = Mock()
+        papers = [{"arxiv_id": "1"}]
+
+        gen = paper_research_orchestrator(
+            ctx,
+            {"main_topic": "ml", "query": "nn", "papers": papers, "seen_ids": ["1"]}
+        )
+
+        with pytest.raises(StopIteration) as exc_info:
+            next(gen)
+
+        ctx.call_activity.assert_not_called()
+        assert exc_info.value.value["summary"] == "No new papers found for this query"
+        assert exc_info.value.value["top_papers"] == []
+
+    def test_orchestrator_analyzes_large_result_in_chunks(self):
+        """Test many papers are analyzed in concurrent chunks and then merged."""
+        from arxiv_research_agent.orchestrations import (
+            ANALYZE_CHUNK_SIZE,
+            paper_research_orchestrator,
+        )
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="activity_call")
+        papers = [{"arxiv_id": str(i)} for i in range(ANALYZE_CHUNK_SIZE * 2 + 1)]
+        partials = [{"query": "neural networks"}] * 3
+
+        with patch("arxiv_research_agent.orchestrations.task.when_all") as mock_when_all:
+            mock_when_all.return_value = "fanout_call"
+            gen = paper_research_orchestrator(
+                ctx,
+                {"main_topic": "machine learning", "query": "neural networks", "papers": papers}
+            )
+
+            assert next(gen) == "fanout_call"
+
+        chunk_inputs = [c.kwargs["input"]["papers"] for c in ctx.call_activity.call_args_list]
+        assert chunk_inputs == [
+            papers[:ANALYZE_CHUNK_SIZE],
+            papers[ANALYZE_CHUNK_SIZE:ANALYZE_CHUNK_SIZE * 2],
+            papers[ANALYZE_CHUNK_SIZE * 2:],
+        ]
+        assert mock_when_all.call_args.args[0] == ["activity_call"] * 3
+
+        assert gen.send(partials) == "activity_call"
+        ctx.call_activity.assert_called_with(
+            "merge_analyses_activity",
+            input={"query": "neural networks", "analyses": partials},
+        )
+
+        with pytest.raises(StopIteration) as exc_info:
+            gen.send({"query": "neural networks", "relevance_score": 7})
+
+        assert exc_info.value.value == {"query": "neural networks", "relevance_score": 7}
+
+
+    def test_orchestrator_chunks_prefetched_unseen_papers(self):
+        """Test prefetched follow-up papers are filtered, then analyzed in chunks."""
+        from arxiv_research_agent.orchestrations import (
+            ANALYZE_CHUNK_SIZE,
+            paper_research_orchestrator,
+        )
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="analyze_call")
+        papers = [{"arxiv_id": str(i)} for i in range(ANALYZE_CHUNK_SIZE * 3)]
+        seen_ids = [str(i) for i in range(ANALYZE_CHUNK_SIZE)]
+
+        with patch("arxiv_research_agent.orchestrations.task.when_all") as mock_when_all:
+            mock_when_all.return_value = "fanout_call"
+            gen = paper_research_orchestrator(ctx, {
+                "main_topic": "machine learning",
+                "query": "neural networks",
+                "papers": papers,
+                "seen_ids": seen_ids,
+            })
+
+            assert next(gen) == "fanout_call"
+
+        chunk_inputs = [c.kwargs["input"]["papers"] for c in ctx.call_activity.call_args_list]
+        assert chunk_inputs == [
+            papers[ANALYZE_CHUNK_SIZE:ANALYZE_CHUNK_SIZE * 2],
+            papers[ANALYZE_CHUNK_SIZE * 2:],
+        ]
+
+
 class TestArxivResearchOrchestrator:
     """Tests for arxiv_research_orchestrator with continue_as_new pattern."""
 
+    @pytest.fixture(autouse=True)
+    def mock_when_all(self):
+        """Replace task.when_all so fan-out can be driven with plain values."""
+        with patch("arxiv_research_agent.orchestrations.task.when_all") as mock:
+            mock.return_value = "fanout_call"
+            yield mock
+
     def test_orchestrator_early_termination(self):
         """Test orchestrator returns final result when should_continue is False."""
         from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
@@ -111,13 +268,13 @@ class TestArxivResearchOrchestrator:
 
         gen = arxiv_research_orchestrator(ctx, input_data)
 
-        assert next(gen) == "sub_call"
+        assert next(gen) == "fanout_call"
         ctx.call_sub_orchestrator.assert_called_once_with(
             "paper_research_orchestrator",
-            input={"main_topic": "deep learning", "query": "deep learning"},
+            input={"main_topic": "deep learning", "query": "deep learning", "seen_ids": []},
         )
 
-        assert gen.send(analysis) == "decide_call"
+        assert gen.send([analysis]) == "decide_call"
         decide_call = ctx.call_activity.call_args_list[0]
         assert decide_call == call(
             "decide_continuation_activity",
@@ -135,7 +292,7 @@ class TestArxivResearchOrchestrator:
         write_call = ctx.call_activity.call_args_list[1]
         assert write_call == call(
             "synthesize_research_activity",
-            input={"topic": "deep learning", "all_findings": [analysis]},
+            input={"topic": "deep learning", "all_findings": [analysis], "citations": {}},
             retry_policy=ANY,
         )
 
@@ -151,7 +308,7 @@ class TestArxivResearchOrchestrator:
 
     def test_orchestrator_continue_as_new(self):
         """Test orchestrator calls continue_as_new when continuing to next iteration."""
-        from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
+        from arxiv_research_agent.orchestrations import _pack_findings, arxiv_research_orchestrator
 
         ctx = Mock()
         ctx.call_sub_orchestrator = Mock(return_value="sub_call")
@@ -166,32 +323,146 @@ class TestArxivResearchOrchestrator:
             "summary": "summary",
             "key_points": [],
             "research_gaps": ["gap1"],
-            "top_papers": [],
+            "top_papers": [{"arxiv_id": "2301.00001v1"}, {"arxiv_id": "2301.00002v1"}],
+            "new_citations": {"2301.00001v1": {"title": "a"}, "2301.00002v1": {"title": "b"}},
         }
 
         gen = arxiv_research_orchestrator(ctx, input_data)
 
-        # First yield: sub_orchestrator call
-        assert next(gen) == "sub_call"
+        # First yield: fan-out over sub_orchestrator calls
+        assert next(gen) == "fanout_call"
 
-        # Send analysis result, get decide_continuation call
-        assert gen.send(analysis) == "decide_call"
+        # Send analysis results, get decide_continuation call
+        assert gen.send([analysis]) == "decide_call"
 
         # Send True (should continue), get identify_research_gaps call
         assert gen.send(True) == "gaps_call"
 
-        # Send follow-up query - should call continue_as_new and end
+        # Send follow-up queries - should call continue_as_new and end
         with pytest.raises(StopIteration):
-            gen.send("follow-up query")
+            gen.send(["follow-up query", "second query"])
 
         # Verify continue_as_new was called with correct state
         ctx.continue_as_new.assert_called_once_with({
             "topic": "deep learning",
             "max_iterations": 3,
             "current_iteration": 1,
-            "all_findings": [analysis],
-            "current_query": "follow-up query"
+            "all_findings": _pack_findings([analysis]),
+            "current_queries": ["follow-up query", "second query"],
+            "all_citations": {
+                "2301.00001v1": {"id": 1, "title": "a"},
+                "2301.00002v1": {"id": 2, "title": "b"},
+            },
         })
+        # Citations move to the registry instead of staying in the findings
+        assert "new_citations" not in analysis
+
+    def test_orchestrator_compacts_findings(self):
+        """Test paper metadata is dropped from findings carried to the next iteration."""
+        from arxiv_research_agent.orchestrations import _unpack_findings, arxiv_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_sub_orchestrator = Mock(return_value="sub_call")
+        ctx.call_activity = Mock(side_effect=["decide_call", "gaps_call"])
+        ctx.continue_as_new = Mock()
+        paper = {"arxiv_id": "2301.00001v1", "title": "t", "summary": "long abstract", "authors": ["a"]}
+        analysis = {
+            "query": "deep learning",
+            "insights": ["i"],
+            "relevance_score": 8,
+            "summary": "s",
+            "key_points": ["k"],
+            "research_gaps": ["g"],
+            "top_papers": [paper],
+            "extra": "not needed later",
+        }
+
+        gen = arxiv_research_orchestrator(ctx, {"topic": "deep learning", "max_iterations": 3})
+        next(gen)
+        gen.send([analysis])
+        gen.send(True)
+        with pytest.raises(StopIteration):
+            gen.send(["follow-up query"])
+
+        finding = _unpack_findings(ctx.continue_as_new.call_args.args[0]["all_findings"])[0]
+        assert finding == {
+            "query": "deep learning",
+            "insights": ["i"],
+            "relevance_score": 8,
+            "summary": "s",
+            "key_points": ["k"],
+            "research_gaps": ["g"],
+            "top_papers": [{"arxiv_id": "2301.00001v1"}],
+        }
+
+    def test_orchestrator_final_iteration_skips_decision(self):
+        """Test the last iteration synthesizes without deciding or finding gaps."""
+        from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_sub_orchestrator = Mock(return_value="sub_call")
+        ctx.call_activity = Mock(return_value="write_call")
+        analysis = {"query": "deep learning", "relevance_score": 8}
+
+        gen = arxiv_research_orchestrator(ctx, {"topic": "deep learning", "max_iterations": 1})
+        assert next(gen) == "fanout_call"
+        assert gen.send([analysis]) == "write_call"
+
+        with pytest.raises(StopIteration) as exc_info:
+            gen.send("Final report")
+
+        ctx.call_activity.assert_called_once_with(
+            "synthesize_research_activity",
+            input={"topic": "deep learning", "all_findings": [analysis], "citations": {}},
+            retry_policy=ANY,
+        )
+        assert exc_info.value.value["iterations"] == 1
+        assert exc_info.value.value["report"] == "Final report"
+
+    def test_orchestrator_caps_follow_up_queries(self):
+        """Test follow-up queries are capped at PARALLEL_FANOUT."""
+        from arxiv_research_agent.orchestrations import (
+            PARALLEL_FANOUT,
+            arxiv_research_orchestrator,
+        )
+
+        ctx = Mock()
+        ctx.call_sub_orchestrator = Mock(return_value="sub_call")
+        ctx.call_activity = Mock(side_effect=["decide_call", "gaps_call"])
+        ctx.continue_as_new = Mock()
+        queries = [f"query {i}" for i in range(PARALLEL_FANOUT + 2)]
+
+        gen = arxiv_research_orchestrator(ctx, {"topic": "deep learning", "max_iterations": 3})
+        next(gen)
+        gen.send([{"query": "deep learning", "relevance_score": 8}])
+        gen.send(True)
+        with pytest.raises(StopIteration):
+            gen.send(queries)
+
+        state = ctx.continue_as_new.call_args.args[0]
+        assert state["current_queries"] == queries[:PARALLEL_FANOUT]
+
+    def test_orchestrator_fans_out_all_queries(self, mock_when_all):
+        """Test every query of an iteration is researched in one parallel fan-out."""
+        from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_sub_orchestrator = Mock(side_effect=["sub_1", "sub_2", "sub_3"])
+        ctx.call_activity = Mock(return_value="multi_search_call")
+        queries = ["query a", "query b", "query c"]
+
+        gen = arxiv_research_orchestrator(ctx, {
+            "topic": "deep learning",
+            "max_iterations": 3,
+            "current_iteration": 1,
+            "current_queries": queries,
+        })
+        next(gen)
+        assert gen.send({query: [] for query in queries}) == "fanout_call"
+
+        researched = [c.kwargs["input"]["query"] for c in ctx.call_sub_orchestrator.call_args_list]
+        assert researched == queries
+        mock_when_all.assert_called_once_with(["sub_1", "sub_2", "sub_3"])
 
     def test_orchestrator_max_iterations_reached(self):
         """Test orchestrator synthesizes when starting at max iterations."""
@@ -207,7 +478,8 @@ class TestArxivResearchOrchestrator:
             "max_iterations": 2,
             "current_iteration": 2,
             "all_findings": previous_findings,
-            "current_query": "last query"
+            "current_queries": ["last query"],
+            "all_citations": {"2301.00001v1": {"id": 1, "title": "t"}},
         }
 
         gen = arxiv_research_orchestrator(ctx, input_data)
@@ -216,7 +488,11 @@ class TestArxivResearchOrchestrator:
         assert next(gen) == "write_call"
         ctx.call_activity.assert_called_once_with(
             "synthesize_research_activity",
-            input={"topic": "deep learning", "all_findings": previous_findings},
+            input={
+                "topic": "deep learning",
+                "all_findings": previous_findings,
+                "citations": {"2301.00001v1": {"id": 1, "title": "t"}},
+            },
             retry_policy=ANY,
         )
 
@@ -244,12 +520,12 @@ class TestArxivResearchOrchestrator:
 
         gen = arxiv_research_orchestrator(ctx, input_data)
 
-        assert next(gen) == "sub_call"
-        assert gen.send(analysis) == "decide_call"
+        assert next(gen) == "fanout_call"
+        assert gen.send([analysis]) == "decide_call"
         assert gen.send(True) == "gaps_call"
 
-        # No follow-up query found (None) - should synthesize
-        assert gen.send(None) == "write_call"
+        # No follow-up queries found - should synthesize
+        assert gen.send([]) == "write_call"
 
         with pytest.raises(StopIteration) as exc_info:
             gen.send("final report")
@@ -272,15 +548,15 @@ class TestArxivResearchOrchestrator:
 
         gen = arxiv_research_orchestrator(ctx, input_data)
 
-        assert next(gen) == "sub_call"
+        assert next(gen) == "fanout_call"
 
-    def test_orchestrator_state_from_continue_as_new(self):
+    def test_orchestrator_state_from_continue_as_new(self, mock_when_all):
         """Test orchestrator correctly resumes from continue_as_new state."""
         from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
 
         ctx = Mock()
-        ctx.call_sub_orchestrator = Mock(return_value="sub_call")
-        ctx.call_activity = Mock(side_effect=["decide_call", "write_call"])
+        ctx.call_sub_orchestrator = Mock(side_effect=["sub_call_1", "sub_call_2"])
+        ctx.call_activity = Mock(side_effect=["multi_search_call", "decide_call"])
 
         # Simulate state passed from previous continue_as_new
         previous_findings = [{"query": "initial query", "summary": "first iteration"}]
@@ -289,18 +565,102 @@ class TestArxivResearchOrchestrator:
             "max_iterations": 3,
             "current_iteration": 1,
             "all_findings": previous_findings,
-            "current_query": "follow-up query"
+            "current_queries": ["follow-up query", "second query"],
+            "all_citations": {"2301.00001v1": {"id": 1, "title": "x"}},
         }
+        papers_by_query = {"follow-up query": [{"title": "a"}], "second query": [{"title": "b"}]}
+        analyses = [
+            {
+                "query": "follow-up query",
+                "new_citations": {"2301.00002v1": {"title": "b"}},
+            },
+            {
+                "query": "second query",
+                "new_citations": {"2301.00003v1": {"title": "c"}},
+            },
+        ]
 
         gen = arxiv_research_orchestrator(ctx, input_data)
 
-        # Should use the current_query from state
-        assert next(gen) == "sub_call"
+        # Should fetch papers for all current_queries with a single search
+        assert next(gen) == "multi_search_call"
+        ctx.call_activity.assert_called_once_with(
+            "search_arxiv_multi_activity",
+            input=["follow-up query", "second query"],
+            retry_policy=ANY,
+        )
+
+        # Then research each query in parallel with its prefetched papers
+        assert gen.send(papers_by_query) == "fanout_call"
+        assert ctx.call_sub_orchestrator.call_args_list == [
+            call(
+                "paper_research_orchestrator",
+                input={
+                    "main_topic": "deep learning",
+                    "query": query,
+                    "seen_ids": ["2301.00001v1"],
+                    "papers": papers_by_query[query],
+                },
+            )
+            for query in ["follow-up query", "second query"]
+        ]
+        mock_when_all.assert_called_once_with(["sub_call_1", "sub_call_2"])
+
+        # Findings are appended in query order
+        assert gen.send(analyses) == "decide_call"
+        assert ctx.call_activity.call_args.kwargs["input"]["all_findings"] == [
+            previous_findings[0],
+            {"query": "follow-up query"},
+            {"query": "second query"},
+        ]
+        # New citations are numbered after existing ones, in query order
+        assert input_data["all_citations"] == {
+            "2301.00001v1": {"id": 1, "title": "x"},
+            "2301.00002v1": {"id": 2, "title": "b"},
+            "2301.00003v1": {"id": 3, "title": "c"},
+        }
+
+    def test_orchestrator_resumes_legacy_current_query(self):
+        """Test state from before fan-out (a single current_query) is honored."""
+        from arxiv_research_agent.orchestrations import arxiv_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_sub_orchestrator = Mock(return_value="sub_call")
+
+        gen = arxiv_research_orchestrator(ctx, {
+            "topic": "deep learning",
+            "max_iterations": 3,
+            "current_iteration": 1,
+            "all_findings": [],
+            "current_query": "follow-up query",
+        })
+
+        assert next(gen) == "fanout_call"
         ctx.call_sub_orchestrator.assert_called_once_with(
             "paper_research_orchestrator",
-            input={"main_topic": "deep learning", "query": "follow-up query"},
+            input={"main_topic": "deep learning", "query": "follow-up query", "seen_ids": []},
         )
 
+    def test_orchestrator_unpacks_packed_findings(self):
+        """Test compressed findings from continue_as_new are restored before use."""
+        from arxiv_research_agent.orchestrations import _pack_findings, arxiv_research_orchestrator
+
+        ctx = Mock()
+        ctx.call_activity = Mock(return_value="write_call")
+        previous_findings = [{"query": "q1", "summary": "s" * 1000}]
+        packed = _pack_findings(previous_findings)
+        assert len(packed) < len(str(previous_findings))
+
+        gen = arxiv_research_orchestrator(ctx, {
+            "topic": "deep learning",
+            "max_iterations": 1,
+            "current_iteration": 1,
+            "all_findings": packed,
+        })
+
+        assert next(gen) == "write_call"
+        assert ctx.call_activity.call_args.kwargs["input"]["all_findings"] == previous_findings
+
 
 class TestOrchestratorIntegration:
     """Integration-style tests for orchestrators."""
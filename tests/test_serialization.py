@@ -0,0 +1,78 @@
+"""Tests for payload serialization."""
+
+import json
+from dataclasses import dataclass
+
+import pytest
+from durabletask.serialization import JsonDataConverter
+
+from arxiv_research_agent.serialization import OrjsonDataConverter
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+class TestOrjsonDataConverter:
+    """Tests for OrjsonDataConverter."""
+
+    def test_round_trips_orchestration_state(self):
+        """Test plain JSON state survives serialization unchanged."""
+        converter = OrjsonDataConverter()
+        state = {
+            "topic": "deep learning",
+            "current_iteration": 2,
+            "all_findings": [{"query": "q", "relevance_score": 7, "insights": ["é"]}],
+            "all_citations": {"2301.00002v1": {"id": 1}, "2301.00001v1": {"id": 2}},
+        }
+        
+        data = converter.serialize(state)
+        
+        assert isinstance(data, str)
+        assert json.loads(data) == state
+        assert converter.deserialize(data) == state
+        # Key order (citation discovery order) is preserved
+        assert list(converter.deserialize(data)["all_citations"]) == ["2301.00002v1", "2301.00001v1"]
+
+    def test_none_and_empty(self):
+        """Test None and empty payloads follow the SDK conventions."""
+        converter = OrjsonDataConverter()
+        
+        assert converter.serialize(None) is None
+        assert converter.deserialize(None) is None
+        assert converter.deserialize("") is None
+
+    def test_falls_back_for_unsupported_values(self):
+        """Test values orjson rejects are handled by the default converter."""
+        converter = OrjsonDataConverter()
+        
+        assert json.loads(converter.serialize({1: "a"})) == {"1": "a"}
+
+    def test_typed_deserialization_uses_default_converter(self):
+        """Test target_type reconstruction is delegated to the SDK."""
+        converter = OrjsonDataConverter()
+        
+        assert converter.deserialize('{"x": 1, "y": 2}', _Point) == _Point(1, 2)
+
+    @pytest.mark.parametrize("payload", [
+        '{"topic": "t", "all_findings": [{"query": "q", "relevance_score": 7}]}',
+        '{"__durabletask_autoobject__": true, "topic": "t", "iterations": 2}',
+        '[{"__durabletask_autoobject__": true, "query": "q"}]',
+        '{"relevance_score": NaN, "upper": Infinity}',
+    ])
+    def test_reads_sdk_converter_payloads_like_the_sdk(self, payload):
+        """Test payloads in existing histories decode exactly as the SDK decodes them."""
+        sdk = JsonDataConverter()
+        
+        expected = sdk.deserialize(payload)
+        result = OrjsonDataConverter().deserialize(payload)
+        
+        assert repr(result) == repr(expected)
+
+    def test_round_trips_sdk_converter_output(self):
+        """Test values serialized by the SDK converter come back unchanged."""
+        state = {"topic": "t", "current_iteration": 1, "scores": [7.5, float("inf")]}
+        
+        assert OrjsonDataConverter().deserialize(JsonDataConverter().serialize(state)) == state